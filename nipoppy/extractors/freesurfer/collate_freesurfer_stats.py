@@ -166,8 +166,8 @@ if __name__ == "__main__":
         print(f"Number of aseg vol ROIs after UKBB merge: {len(roi_field_id_dict)}")
 
         # Rename ROIs with ukbb ids (remove the ROIs which don't have ukbb ids)
-        stat_measure_df = stat_measure_df[["subject_id"] + common_rois].copy()
-        stat_measure_df = stat_measure_df.rename(columns=roi_field_id_dict)
+        # no copy needed: rename already returns a new dataframe
+        stat_measure_df = stat_measure_df[["subject_id"] + common_rois].rename(columns=roi_field_id_dict)
 
         save_file = f"aseg_subcortical_volumes.csv"
         
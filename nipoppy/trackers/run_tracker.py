@@ -2,7 +2,7 @@
 import argparse
 import bids 
 import json
-import tarfile
+import os
 import warnings
 from pathlib import Path
 import pandas as pd
@@ -28,6 +28,7 @@ from nipoppy.workflow.utils import (
 
 # Globals
 PIPELINE_STATUS_COLUMNS = "PIPELINE_STATUS_COLUMNS"
+TAR_EXTENSIONS = ['.tar', '.tar.gz'] # tarred subject-session outputs
 pipeline_tracker_config_dict = {
     "heudiconv": bids_tracker.tracker_configs, 
     "freesurfer": fs_tracker.tracker_configs,
@@ -187,9 +188,13 @@ def run(global_configs, dash_schema_file, pipelines, session_id="ALL", run_id="1
             else:
                 df_bagel_old = None
             
+            # collect the values for each participant and write them all at once
+            # at the end (instead of one .loc assignment per cell)
+            rows = {}
             for bids_id, participant_id, available_datatypes in df_manifest_session[[COL_BIDS_ID_MANIFEST, COL_SUBJECT_MANIFEST, COL_DATATYPE_MANIFEST]].itertuples(index=False):
-                _df.loc[bids_id, COL_SUBJECT_MANIFEST] = participant_id
-                _df.loc[bids_id, COL_BIDS_ID_MANIFEST] = bids_id
+                row = rows.setdefault(bids_id, {})
+                row[COL_SUBJECT_MANIFEST] = participant_id
+                row[COL_BIDS_ID_MANIFEST] = bids_id
 
                 # TODO eventually we should move these to the {pipeline}_tracker.py files
                 if pipeline == "heudiconv":
@@ -203,13 +208,9 @@ def run(global_configs, dash_schema_file, pipelines, session_id="ALL", run_id="1
                     # NOTE temporary solution while we refactor tracker configs to be version-specific
                     if pipeline == "fmriprep":
                         subject_ses_dir = f"{subject_dir}/{session}"
-                        subject_ses_tar_paths = [
-                            Path(subject_ses_dir).with_suffix('.tar'),
-                            Path(subject_ses_dir).with_suffix('.tar.gz'),
-                        ]
                         if (
-                            not Path(subject_dir).is_dir() and
-                            not any([path.exists() for path in subject_ses_tar_paths])
+                            not os.path.isdir(subject_dir) and
+                            not any(os.path.exists(f'{os.path.splitext(subject_ses_dir)[0]}{ext}') for ext in TAR_EXTENSIONS)
                             ):
                             subject_dir = f"{DATASET_ROOT}/derivatives/{pipeline}/{version}/output/fmriprep/{bids_id}"
                     subject_ses_dir = f"{subject_dir}/{session}"
@@ -223,31 +224,28 @@ def run(global_configs, dash_schema_file, pipelines, session_id="ALL", run_id="1
                 required_datatypes = PIPELINE_REQUIRED_DATATYPES[pipeline]
                 has_required_datatypes = True
                 for datatype in ALL_DATATYPES:
-                    _df.loc[bids_id, f"HAS_DATATYPE__{datatype}"] = datatype in available_datatypes
+                    row[f"HAS_DATATYPE__{datatype}"] = datatype in available_datatypes
                     if (datatype in required_datatypes) and (datatype not in available_datatypes):
                         has_required_datatypes = False
                 
                 if has_required_datatypes:
 
-                    subject_ses_dir_status = Path(subject_ses_dir).is_dir()
-                    subject_ses_tar_paths = [
-                        Path(subject_ses_dir).with_suffix('.tar'),
-                        Path(subject_ses_dir).with_suffix('.tar.gz'),
-                    ]
-                    subject_ses_tar_status = any([path.exists() for path in subject_ses_tar_paths])
+                    subject_ses_dir_status = os.path.isdir(subject_ses_dir)
+                    # stops at the first tarball found
+                    subject_ses_tar_status = any(os.path.exists(f'{os.path.splitext(subject_ses_dir)[0]}{ext}') for ext in TAR_EXTENSIONS)
                     logger.debug(f"subject_ses_dir: {subject_ses_dir}, dir_status: {subject_ses_dir_status}, subject_ses_tar_status: {subject_ses_tar_status}")
 
                     if subject_ses_tar_status:
                         logger.debug(f"subject_ses_dir: {subject_ses_dir} is a tar file")
                         for name in status_check_dict.keys():
                             if name == 'pipeline_complete':
-                                _df.loc[bids_id,name] = SUCCESS
+                                row[name] = SUCCESS
                             else:
                                 # here, UNAVAILABLE refers to the functionality not being implemented yet for phases/stages
                                 # unrelated to pipeline_complete being UNAVAILABLE, which is related to the datatypes column in the manifest
-                                _df.loc[bids_id,name] = UNAVAILABLE  # TODO check if files are available in the tar file
-                            _df.loc[bids_id,"pipeline_starttime"] = UNAVAILABLE
-                            _df.loc[bids_id,"pipeline_endtime"] = UNAVAILABLE
+                                row[name] = UNAVAILABLE  # TODO check if files are available in the tar file
+                            row["pipeline_starttime"] = UNAVAILABLE
+                            row["pipeline_endtime"] = UNAVAILABLE
                     elif subject_ses_dir_status:
                         for name, func in status_check_dict.items():
                             if pipeline == "heudiconv":
@@ -257,22 +255,26 @@ def run(global_configs, dash_schema_file, pipelines, session_id="ALL", run_id="1
 
                             logger.debug(f"task_name: {name}, status: {status}")                        
 
-                            _df.loc[bids_id,name] = status
-                            _df.loc[bids_id,"pipeline_starttime"] = get_start_time(subject_dir)
+                            row[name] = status
+                            row["pipeline_starttime"] = get_start_time(subject_dir)
                             # TODO only check files listed in the tracker config
-                            _df.loc[bids_id,"pipeline_endtime"] = UNAVAILABLE # get_end_time(subject_dir)
+                            row["pipeline_endtime"] = UNAVAILABLE # get_end_time(subject_dir)
                     else:
                         logger.debug(f"{pipeline} output is expected based on manifest but not found for bids_id: {bids_id}, session: {session}")
                         for name in status_check_dict.keys():
-                            _df.loc[bids_id, name] = INCOMPLETE
-                        _df.loc[bids_id, "pipeline_starttime"] = UNAVAILABLE
-                        _df.loc[bids_id, "pipeline_endtime"] = UNAVAILABLE
+                            row[name] = INCOMPLETE
+                        row["pipeline_starttime"] = UNAVAILABLE
+                        row["pipeline_endtime"] = UNAVAILABLE
                 else:
                     logger.debug(f"{pipeline} output is not expected based on manifest for bids_id: {bids_id}, session: {session}")
                     for name in status_check_dict.keys():
-                        _df.loc[bids_id, name] = UNAVAILABLE
-                    _df.loc[bids_id, "pipeline_starttime"] = UNAVAILABLE
-                    _df.loc[bids_id, "pipeline_endtime"] = UNAVAILABLE
+                        row[name] = UNAVAILABLE
+                    row["pipeline_starttime"] = UNAVAILABLE
+                    row["pipeline_endtime"] = UNAVAILABLE
+
+            if len(rows) > 0:
+                df_rows = pd.DataFrame.from_dict(rows, orient='index')
+                _df.loc[df_rows.index, df_rows.columns] = df_rows
 
             _df = _df.reset_index(drop=True)
 
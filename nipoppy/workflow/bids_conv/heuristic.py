@@ -1,6 +1,7 @@
 import json
 import re
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 from typing import Sequence
 
@@ -25,8 +26,8 @@ COL_PROTOCOL = 'Imaging Protocol'
 COL_IMAGE_ID = 'Image ID'
 COL_MODALITY = 'Modality'
 MODALITY_DWI = 'DTI'
-RE_IMAGE_ID = '.*_I([0-9]+).dcm' # regex
-RE_NEUROMELANIN = '[nN][mM]' # neuromelanin pattern
+RE_IMAGE_ID = re.compile('.*_I([0-9]+).dcm') # compiled once, used for every series
+RE_NEUROMELANIN = re.compile('[nN][mM]') # neuromelanin pattern
 SEP_PROTOCOL_INFO_ENTRY = ';'
 SEP_PROTOCOL_INFO = '='
 KEY_PLANE = 'Acquisition Plane'
@@ -36,7 +37,7 @@ KEY_DIMS = 'Acquisition Type'
 VALID_DIRS = ['AP', 'PA', 'LR', 'RL']
 DIR_RE_MAP = {
     # will catch: ' R L', '_RL', 'R-L', 'R > L', etc.
-    dir: f'[ \-_]{dir[0]}[ \-_>]*{dir[1]}(?:[ \-_]|\Z)'
+    dir: re.compile(f'[ \-_]{dir[0]}[ \-_>]*{dir[1]}(?:[ \-_]|\Z)')
     for dir in VALID_DIRS
 }
 # for descriptions not handled by the above regex
@@ -80,6 +81,7 @@ TAGS_DIMS = [TAG_2D, TAG_3D]
 PATTERN_ITEM = '{item:02d}'
 
 HEURISTIC_HELPER = None
+DEFAULT_HEURISTIC_HELPER = None
 
 def infotodict(seqinfo, heuristic_helper=None, testing=False):
     """Heuristic evaluator for determining which runs belong where
@@ -89,13 +91,17 @@ def infotodict(seqinfo, heuristic_helper=None, testing=False):
     session: session id (including 'ses-' prefix)
     """
     
-    global HEURISTIC_HELPER
+    global HEURISTIC_HELPER, DEFAULT_HEURISTIC_HELPER
 
-    HEURISTIC_HELPER = heuristic_helper
+    # the default helper (which loads the imaging info and descriptions files)
+    # is only created once, not every time this function is called
+    if heuristic_helper is None:
+        if DEFAULT_HEURISTIC_HELPER is None:
+            print('initializing HeuristicHelper in heuristic')
+            DEFAULT_HEURISTIC_HELPER = HeuristicHelper()
+        heuristic_helper = DEFAULT_HEURISTIC_HELPER
 
-    if HEURISTIC_HELPER is None:
-        print('initializing HeuristicHelper in heuristic')
-        HEURISTIC_HELPER = HeuristicHelper()
+    HEURISTIC_HELPER = heuristic_helper
 
     info = defaultdict(list)
     for _, s in enumerate(seqinfo):
@@ -143,7 +149,7 @@ def infotodict(seqinfo, heuristic_helper=None, testing=False):
             dims = None
             if datatype == DATATYPE_ANAT:
 
-                if re.search(RE_NEUROMELANIN, s.series_description):
+                if RE_NEUROMELANIN.search(s.series_description):
                     info[create_key_anat(suffix, acq=TAG_NEUROMELANIN)].append(to_append)
 
                 else:
@@ -192,6 +198,9 @@ def infotodict(seqinfo, heuristic_helper=None, testing=False):
 
     return info
 
+# keys only depend on the arguments and the same few keys are created for
+# every series, so the template strings are only built once per combination
+@lru_cache(maxsize=None)
 def create_key_anat(suffix, plane=None, dims=None, acq=None):
 
     if (acq is not None) and (plane is not None or dims is not None):
@@ -206,6 +215,7 @@ def create_key_anat(suffix, plane=None, dims=None, acq=None):
 
     return create_key(DATATYPE_ANAT, stem)
 
+@lru_cache(maxsize=None)
 def create_key_dwi(suffix=SUFFIX_DWI, dir=None, acq=None):
 
     if dir is not None:
@@ -226,7 +236,7 @@ def create_key(datatype, stem, outtype=('nii.gz',), annotation_classes=None):
     return template, outtype, annotation_classes
 
 def get_image_id_from_dcm(fname_dcm):
-    match = re.match(RE_IMAGE_ID, fname_dcm)
+    match = RE_IMAGE_ID.match(fname_dcm)
     if not match:
         raise RuntimeError(f'Could not get image ID from {fname_dcm}')
     if len(match.groups()) > 1:
@@ -245,7 +255,7 @@ def get_dwi_dir_from_description(description: str):
 
     # then infer using regexes
     for dir, re_dir in DIR_RE_MAP.items():
-        if re.search(re_dir, description):
+        if re_dir.search(description):
             return dir
         
     # no direction found
@@ -272,11 +282,17 @@ class HeuristicHelper:
         if not self.fpath_descriptions.exists():
             raise FileNotFoundError(f'Descriptions map file {self.fpath_descriptions} does not exist')
         
-        self.df_imaging = pd.read_csv(self.fpath_imaging, dtype=str).set_index(COL_IMAGE_ID)
+        # only parse the columns used by the heuristic
+        self.df_imaging = pd.read_csv(
+            self.fpath_imaging, dtype=str,
+            usecols=[COL_IMAGE_ID, COL_PROTOCOL, COL_MODALITY],
+        ).set_index(COL_IMAGE_ID)
         
         with open(self.fpath_descriptions, 'r') as file_descriptions:
             self.descriptions_map = json.load(file_descriptions)
 
+        self._description_datatype_suffix_map = None
+
     def get_descriptions(self, keys) -> list[str]:
 
         keys_all = keys[:]
@@ -296,13 +312,24 @@ class HeuristicHelper:
     
     def get_datatype_suffix_from_description(self, description: str):
         description = description.strip()
-        for datatype in self.datatypes:
-            if datatype == DATATYPE_ANAT:
-                for suffix in self.suffixes_anat:
-                    if description in self.get_descriptions([datatype, suffix]):
-                        return datatype, suffix
-            else:
-                if description in self.get_descriptions([datatype]):
-                    return datatype, None
+        try:
+            return self.get_description_datatype_suffix_map()[description]
+        except KeyError:
+            raise RuntimeError(f'Could not find datatype for description {description}')
+
+    def get_description_datatype_suffix_map(self) -> dict:
+        # description -> (datatype, suffix) lookup table, built once
+        # so that each series does a dict lookup instead of scanning the description lists
+        # (first match wins, in the same order as the datatypes/suffixes lists)
+        if self._description_datatype_suffix_map is None:
+            description_datatype_suffix_map = {}
+            for datatype in self.datatypes:
+                if datatype == DATATYPE_ANAT:
+                    for suffix in self.suffixes_anat:
+                        for description in self.get_descriptions([datatype, suffix]):
+                            description_datatype_suffix_map.setdefault(description, (datatype, suffix))
                 else:
-                    raise RuntimeError(f'Could not find datatype for description {description}')
+                    for description in self.get_descriptions([datatype]):
+                        description_datatype_suffix_map.setdefault(description, (datatype, None))
+            self._description_datatype_suffix_map = description_datatype_suffix_map
+        return self._description_datatype_suffix_map
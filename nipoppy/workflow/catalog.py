@@ -113,7 +113,7 @@ def get_new_raw_dicoms(fpath_doughnut, session_id, logger):
     else:
         logger.warning(f"{COL_PARTICIPANT_DICOM_DIR} is not specified in the doughnut file")
         logger.info(f"Assuming {COL_SUBJECT_MANIFEST} is the dicom filename") 
-        reorg_df[COL_PARTICIPANT_DICOM_DIR] = reorg_df[COL_SUBJECT_MANIFEST].copy()
+        reorg_df[COL_PARTICIPANT_DICOM_DIR] = reorg_df[COL_SUBJECT_MANIFEST]
 
     logger.info("-"*50)
     logger.info(
@@ -1,9 +1,11 @@
 #!/usr/bin/env python
 
 import argparse
-import glob
 import json
-from joblib import Parallel, delayed
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
@@ -38,6 +40,9 @@ DEFAULT_CHUNK_SIZE = 1000
 # imaging dataframe
 COL_IMAGE_ID = 'Image ID'
 
+# raw DICOM directory names
+RE_IMAGE_DIR = re.compile('I([0-9]+)')
+
 DPATH_TABULAR_RELATIVE = Path('tabular')
 DPATH_RAW_DICOM_RELATIVE = Path('scratch', 'raw_dicom')
 DPATH_DESCRIPTIONS = Path(nipoppy.workflow.tabular.filter_image_descriptions.__file__).parent
@@ -46,7 +51,7 @@ FPATH_MANIFEST_RELATIVE = DPATH_TABULAR_RELATIVE / FNAME_MANIFEST
 FPATH_STATUS_RELATIVE = DPATH_RAW_DICOM_RELATIVE / FNAME_DOUGHNUT
 FPATH_LOGS_RELATIVE = Path('scratch', 'logs', 'fetch_dicom_downloads.log')
 
-def run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=None, logger=None):
+def run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=None, trust_status=False, logger=None):
 
     session_id = session_id_to_bids_session(session_id)
 
@@ -67,6 +72,7 @@ def run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=None, log
         f'\nn_jobs: {n_jobs}'
         f'\ndatatypes: {datatypes}'
         f'\nchunk_size: {chunk_size}'
+        f'\ntrust_status: {trust_status}'
         f'\ndpath_dataset: {dpath_dataset}'
         '\n'
     )
@@ -77,7 +83,12 @@ def run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=None, log
     # load imaging data
     fpath_imaging = dpath_dataset / 'tabular' / 'other' / global_config['TABULAR']['OTHER']['IMAGING_INFO']['FILENAME']
     df_imaging = load_and_process_df_imaging(fpath_imaging)
-    df_imaging[COL_SESSION_MANIFEST] = df_imaging[COL_SESSION_MANIFEST].apply(session_id_to_bids_session)
+    # use categorical columns for the (low-cardinality) session and description columns
+    # so that the session mapping and the filters below work on the unique values/integer codes
+    df_imaging[COL_SESSION_MANIFEST] = df_imaging[COL_SESSION_MANIFEST].astype('category').map(
+        session_id_to_bids_session, na_action='ignore',
+    )
+    df_imaging[COL_DATATYPE_MANIFEST] = df_imaging[COL_DATATYPE_MANIFEST].astype('category')
 
     # load status data
     fpath_status = dpath_dataset / FPATH_STATUS_RELATIVE
@@ -95,45 +106,64 @@ def run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=None, log
         datatype_descriptions_map: dict = json.load(file_descriptions)
 
     # gather all relevant series descriptions to download
-    descriptions = set()
-    for datatype in datatypes:
-        descriptions.update(get_all_descriptions(datatype_descriptions_map[datatype]))
-
-    # filter imaging df
-    df_imaging_keep = df_imaging.loc[
-        (df_imaging[COL_SUBJECT_MANIFEST].isin(df_status_session[COL_SUBJECT_MANIFEST]))
-        & (df_imaging[COL_SESSION_MANIFEST] == session_id)
-        & (df_imaging[COL_DATATYPE_MANIFEST].isin(descriptions))
-    ].copy()
-    participants_all = set(df_imaging_keep[COL_SUBJECT_MANIFEST])
+    # (single traversal of the map restricted to the requested datatypes,
+    # the dict also drops datatypes that were given more than once)
+    descriptions = frozenset(get_all_descriptions(
+        {datatype: datatype_descriptions_map[datatype] for datatype in datatypes}
+    ))
+
+    # filter imaging df: select the session first (cheapest filter)
+    # then combine the other filters into a single boolean mask
+    df_imaging_session = df_imaging.loc[df_imaging[COL_SESSION_MANIFEST] == session_id]
+    # (copy since arrays returned by to_numpy can be read-only)
+    mask_keep = df_imaging_session[COL_DATATYPE_MANIFEST].isin(descriptions).to_numpy(copy=True)
+    mask_keep &= df_imaging_session[COL_SUBJECT_MANIFEST].isin(df_status_session[COL_SUBJECT_MANIFEST].unique()).to_numpy()
+    df_imaging_keep = df_imaging_session.loc[mask_keep]
+    participants_all = pd.Index(df_imaging_keep[COL_SUBJECT_MANIFEST].unique())
 
     # find participants who have already been downloaded
-    participants_downloaded = set(df_status.loc[
-        (
-            (df_status[COL_SESSION_MANIFEST] == session_id) &
-            df_status[COL_DOWNLOAD_STATUS]
-        ),
+    # (reuse the session subset instead of masking the full status file again)
+    participants_downloaded = pd.Index(df_status_session.loc[
+        df_status_session[COL_DOWNLOAD_STATUS],
         COL_SUBJECT_MANIFEST,
-    ])
+    ].unique())
 
     # get image IDs that need to be checked/downloaded
-    participants_to_check = participants_all - participants_downloaded
+    # (pandas Index so that isin can use it directly without converting a Python set)
+    participants_to_check = participants_all.difference(participants_downloaded, sort=False)
+    # (copy needed since a status column is added below)
     df_imaging_to_check: pd.DataFrame = df_imaging_keep.loc[
         df_imaging_keep[COL_SUBJECT_MANIFEST].isin(participants_to_check),
     ].copy()
 
     # check if any image ID has already been downloaded
-    check_status = Parallel(n_jobs=n_jobs)(
-        delayed(check_image_id)(
-            dpath_raw_dicom_session, participant_id, image_id,
+    # (scan each participant directory once instead of globbing once per image)
+    # if the status file is trusted, the raw DICOM directory is not scanned at all
+    participants_to_scan = [] if trust_status else df_imaging_to_check[COL_SUBJECT_MANIFEST].unique()
+    # (plain string paths so that no Path objects are created per participant)
+    dpath_raw_dicom_session_str = os.fspath(dpath_raw_dicom_session)
+    # threads instead of processes: the work is filesystem I/O (releases the GIL)
+    # so there is no need to pickle arguments/results to worker processes
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        participant_image_ids_downloaded = frozenset(
+            (participant_id, image_id)
+            for participant_id, image_ids in zip(
+                participants_to_scan,
+                executor.map(
+                    partial(get_downloaded_image_ids, dpath_raw_dicom_session_str),
+                    participants_to_scan,
+                ),
+            )
+            for image_id in image_ids
         )
-        for participant_id, image_id 
-        in df_imaging_to_check[[COL_SUBJECT_MANIFEST, COL_IMAGE_ID]].itertuples(index=False)
-    )
-    df_imaging_to_check[COL_DOWNLOAD_STATUS] = check_status
+    # vectorized membership test for (participant, image ID) pairs
+    df_imaging_to_check[COL_DOWNLOAD_STATUS] = pd.MultiIndex.from_arrays([
+        df_imaging_to_check[COL_SUBJECT_MANIFEST].to_numpy(),
+        df_imaging_to_check[COL_IMAGE_ID].to_numpy(),
+    ]).isin(participant_image_ids_downloaded)
 
     # update status file
-    participants_to_update = set(df_imaging_to_check.loc[df_imaging_to_check[COL_DOWNLOAD_STATUS], COL_SUBJECT_MANIFEST])
+    participants_to_update = df_imaging_to_check.loc[df_imaging_to_check[COL_DOWNLOAD_STATUS], COL_SUBJECT_MANIFEST].unique()
     if len(participants_to_update) > 0:
         df_status_session.loc[df_status_session[COL_SUBJECT_MANIFEST].isin(participants_to_update), COL_DOWNLOAD_STATUS] = True
         df_status.loc[df_status_session.index] = df_status_session
@@ -152,42 +182,40 @@ def run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=None, log
 
     # get images to download
     image_ids_to_download = df_imaging_to_check.loc[~df_imaging_to_check[COL_DOWNLOAD_STATUS], [COL_SUBJECT_MANIFEST, COL_IMAGE_ID]]
-    image_ids_to_download = image_ids_to_download.sort_values(COL_SUBJECT_MANIFEST)
 
     # output a single chunk if no size is specified
     if chunk_size is None or chunk_size < 1:
         chunk_size = len(image_ids_to_download)
         logger.info(f'Using chunk_size={chunk_size}')
 
+    # group image IDs by subject once
+    # (groupby sorts by subject so the dataframe itself does not need to be sorted)
+    # all images from the same subject must be in the same list
+    # so the lists may be smaller than chunk_size
+    image_ids_by_subject = [
+        image_ids_for_subject[COL_IMAGE_ID].to_list()
+        for _, image_ids_for_subject in image_ids_to_download.groupby(COL_SUBJECT_MANIFEST)
+    ]
+
+    # pack the subject groups into lists of image IDs (in order)
+    download_lists = []
+    download_list = []
+    for image_ids_for_subject in image_ids_by_subject:
+        if len(image_ids_for_subject) > chunk_size:
+            raise RuntimeError(f'chunk_size of {chunk_size} is too small, try increasing to {len(image_ids_for_subject)}')
+        if len(download_list) + len(image_ids_for_subject) > chunk_size:
+            download_lists.append(download_list)
+            download_list = []
+        download_list.extend(image_ids_for_subject)
+    if len(download_list) > 0:
+        download_lists.append(download_list)
+
     # dump image ID list into comma-separated list(s)
-    n_lists = 0
-    download_lists_str = ''
-    while len(image_ids_to_download) > 0:
-        n_lists += 1
-
-        if download_lists_str != '':
-            download_lists_str += '\n\n'
-
-        # generate the list of image IDs to download
-        # all images from the same subject must be in the same list
-        # so the lists may be smaller than chunk_size
-        download_list = []
-        for _, image_ids_for_subject in image_ids_to_download.groupby(COL_SUBJECT_MANIFEST):
-            if len(download_list) + len(image_ids_for_subject) > chunk_size:
-                if len(download_list) == 0:
-                    raise RuntimeError(f'chunk_size of {chunk_size} is too small, try increasing to {len(image_ids_for_subject)}')
-                break
-            download_list.extend(image_ids_for_subject[COL_IMAGE_ID].to_list())
-
-        # build string to print out in one shot by the logger
-        download_lists_str += f'LIST {n_lists} ({len(download_list)})\n'
-        download_lists_str += ','.join(download_list)
-
-        # update for next iteration
-        if len(download_list) < len(image_ids_to_download):
-            image_ids_to_download = image_ids_to_download[len(download_list):]
-        else:
-            image_ids_to_download = []
+    # build string to print out in one shot by the logger
+    download_lists_str = '\n\n'.join(
+        f'LIST {i_list} ({len(download_list)})\n' + ','.join(download_list)
+        for i_list, download_list in enumerate(download_lists, start=1)
+    )
 
     logger.info(
         f'\n\n===== DOWNLOAD LIST(S) FOR {session_id.upper()} =====\n'
@@ -200,9 +228,45 @@ def run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=None, log
         '\n'
     )
 
-def check_image_id(dpath_raw_dicom, subject, image_id):
-    str_pattern = str(dpath_raw_dicom / subject / '*' / '**' / f'I{image_id}' / '*.dcm')
-    return len(list(glob.glob(str_pattern))) > 0
+def get_downloaded_image_ids(dpath_raw_dicom, subject) -> set:
+    # return the IDs of images that have at least one DICOM file
+    # expected layout: <subject>/<description>/<date>/I<image_id>/*.dcm
+    # hidden files/directories are skipped, like with glob
+    def _iter_subdirs(dpath):
+        try:
+            with os.scandir(dpath) as entries:
+                return [
+                    entry for entry in entries
+                    if entry.is_dir() and not entry.name.startswith('.')
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    def _has_dcm(dpath):
+        with os.scandir(dpath) as entries:
+            return any(
+                entry.name.endswith('.dcm') and not entry.name.startswith('.')
+                for entry in entries
+            )
+
+    image_ids = set()
+    for entry_description in _iter_subdirs(os.path.join(dpath_raw_dicom, subject)):
+        for entry_date in _iter_subdirs(entry_description.path):
+            for entry_image in _iter_subdirs(entry_date.path):
+                match = RE_IMAGE_DIR.fullmatch(entry_image.name)
+                if match and _has_dcm(entry_image.path):
+                    image_ids.add(match.group(1))
+    return image_ids
+
+def positive_int(value) -> int:
+    # convert a command-line argument to a strictly positive integer
+    try:
+        value_int = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Invalid integer value: {value}')
+    if value_int < 1:
+        raise argparse.ArgumentTypeError(f'Value must be a positive integer, got {value}')
+    return value_int
 
 if __name__ == '__main__':
     # argparse
@@ -215,9 +279,14 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description=HELPTEXT)
     parser.add_argument('--global_config', type=str, help='path to global config file for your nipoppy dataset', required=True)
     parser.add_argument('--session_id', type=str, default=None, help='MRI session (i.e. visit) to process)', required=True)
-    parser.add_argument('--n_jobs', type=int, default=DEFAULT_N_JOBS, help=f'number of parallel processes (default: {DEFAULT_N_JOBS})')
+    parser.add_argument('--n_jobs', type=positive_int, default=DEFAULT_N_JOBS, help=f'number of threads for checking downloaded files (default: {DEFAULT_N_JOBS})')
     parser.add_argument('--datatypes', nargs='+', help=f'BIDS datatypes to download (default: {DEFAULT_DATATYPES})', default=DEFAULT_DATATYPES)
     parser.add_argument('--chunk_size', type=int, default=DEFAULT_CHUNK_SIZE, help=f'(default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--trust_status', action='store_true', help=(
+        'trust the status file and do not scan the raw DICOM directory for already downloaded images'
+        ' (faster, but images downloaded since the status file was last updated will be listed again'
+        ' until the script is run without this flag)'
+    ))
 
     args = parser.parse_args()
     fpath_global_config = args.global_config
@@ -225,5 +294,6 @@ if __name__ == '__main__':
     n_jobs = args.n_jobs
     datatypes = args.datatypes
     chunk_size = args.chunk_size
+    trust_status = args.trust_status
 
-    run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=chunk_size)
+    run(fpath_global_config, session_id, n_jobs, datatypes, chunk_size=chunk_size, trust_status=trust_status)
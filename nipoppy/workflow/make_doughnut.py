@@ -2,7 +2,9 @@
 
 import argparse
 import json
+import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -33,13 +35,15 @@ from nipoppy.workflow.utils import (
 DPATH_DOUGHNUT_RELATIVE = Path('scratch', 'raw_dicom')
 FPATH_MANIFEST_RELATIVE = Path('tabular') / FNAME_MANIFEST
 
+N_JOBS = 1
+
 FLAG_EMPTY = '--empty'
 FLAG_REGENERATE = '--regenerate' # TODO move this to common utils?
 
 GLOBAL_CONFIG_DATASET_ROOT = 'DATASET_ROOT'
 GLOBAL_CONFIG_SESSIONS = 'SESSIONS'
 
-def run(global_config: dict, regenerate=False, empty=False):
+def run(global_config: dict, regenerate=False, empty=False, n_jobs=N_JOBS):
     
     dpath_dataset = Path(global_config[GLOBAL_CONFIG_DATASET_ROOT])
 
@@ -104,12 +108,12 @@ def run(global_config: dict, regenerate=False, empty=False):
         map_file = None
 
     # generate bids_id
-    df_doughnut[COL_BIDS_ID_MANIFEST] = df_doughnut.apply(
-            lambda row: participant_id_to_bids_id(
-                row[COL_SUBJECT_MANIFEST],
-                map_file),
-            axis='columns'
-        )
+    # (list comprehension over the underlying array instead of a row-wise apply,
+    # which builds a Series for every row)
+    df_doughnut[COL_BIDS_ID_MANIFEST] = [
+        participant_id_to_bids_id(participant_id, map_file)
+        for participant_id in df_doughnut[COL_SUBJECT_MANIFEST].to_numpy()
+    ]
     
     # initialize dicom dir (cannot be inferred directly from participant id)
     df_doughnut.loc[:, COL_PARTICIPANT_DICOM_DIR] = np.nan
@@ -138,28 +142,31 @@ def run(global_config: dict, regenerate=False, empty=False):
                 'See sample_dicom_dir_func.py for an example.'
             )
 
-        df_doughnut[COL_PARTICIPANT_DICOM_DIR] = df_doughnut.apply(
-            lambda row: participant_id_to_dicom_dir(
-                row[COL_SUBJECT_MANIFEST],
-                str(row[COL_SESSION_MANIFEST]).removeprefix(BIDS_SESSION_PREFIX),
+        df_doughnut[COL_PARTICIPANT_DICOM_DIR] = [
+            participant_id_to_dicom_dir(
+                participant_id,
+                str(session).removeprefix(BIDS_SESSION_PREFIX),
                 global_config,
-            ),
-            axis='columns',
-        )
+            )
+            for participant_id, session in zip(
+                df_doughnut[COL_SUBJECT_MANIFEST].to_numpy(),
+                df_doughnut[COL_SESSION_MANIFEST].to_numpy(),
+            )
+        ]
 
         # look for raw DICOM: scratch/raw_dicom/session/dicom_dir
         df_doughnut[COL_DOWNLOAD_STATUS] = check_status(
-            df_doughnut, dpath_downloaded_dicom, COL_PARTICIPANT_DICOM_DIR, session_first=True,
+            df_doughnut, dpath_downloaded_dicom, COL_PARTICIPANT_DICOM_DIR, session_first=True, n_jobs=n_jobs,
         )
 
         # look for organized DICOM
         df_doughnut[COL_ORG_STATUS] = check_status(
-            df_doughnut, dpath_organized_dicom, COL_DICOM_ID, session_first=True,
+            df_doughnut, dpath_organized_dicom, COL_DICOM_ID, session_first=True, n_jobs=n_jobs,
         )
 
         # look for BIDS: bids/bids_id/session
         df_doughnut[COL_CONV_STATUS] = check_status(
-            df_doughnut, dpath_converted, COL_BIDS_ID_MANIFEST, session_first=False,
+            df_doughnut, dpath_converted, COL_BIDS_ID_MANIFEST, session_first=False, n_jobs=n_jobs,
         )
 
         # warn user if there are rows with a 'True' column after one or more 'False' columns
@@ -210,27 +217,33 @@ def run(global_config: dict, regenerate=False, empty=False):
     # save backup and make symlink
     save_backup(df_doughnut, fpath_doughnut_symlink, DNAME_BACKUPS_DOUGHNUT)
 
-def check_status(df: pd.DataFrame, dpath, col_dname, session_first=True):
+def check_status(df: pd.DataFrame, dpath, col_dname, session_first=True, n_jobs=N_JOBS):
 
     def check_dir(dpath):
-        dpath = Path(dpath)
-        if dpath.exists():
-            return len(list(dpath.iterdir())) > 0
-        return False
+        # single opendir/readdir (no separate exists() call), stop at the first entry
+        try:
+            with os.scandir(dpath) as entries:
+                return next(entries, None) is not None
+        except (FileNotFoundError, NotADirectoryError):
+            return False
     
-    dpath = Path(dpath)
+    dpath = os.fspath(dpath)
     status = pd.Series(np.nan, index=df.index, dtype=bool)
-    for session in df[COL_SESSION_MANIFEST].drop_duplicates():
-        if pd.isna(session):
-            continue
-        idx = (df[COL_SESSION_MANIFEST] == session)
-
-        if session_first:
-            check_func = lambda dname: check_dir(dpath / session / dname)
-        else:
-            check_func = lambda dname: check_dir(dpath / dname / session)
+    has_session = df[COL_SESSION_MANIFEST].notna()
+    if session_first:
+        dpaths_to_check = [
+            os.path.join(dpath, session, dname)
+            for session, dname in zip(df.loc[has_session, COL_SESSION_MANIFEST], df.loc[has_session, col_dname])
+        ]
+    else:
+        dpaths_to_check = [
+            os.path.join(dpath, dname, session)
+            for session, dname in zip(df.loc[has_session, COL_SESSION_MANIFEST], df.loc[has_session, col_dname])
+        ]
 
-        status.loc[idx] = df[col_dname].apply(check_func)
+    # check directories in threads
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        status.loc[has_session] = np.fromiter(executor.map(check_dir, dpaths_to_check), dtype=bool, count=len(dpaths_to_check))
 
     return status
 
@@ -251,15 +264,19 @@ if __name__ == '__main__':
     parser.add_argument(
         FLAG_EMPTY, action='store_true', 
         help='generate empty doughnut file (without checking what\'s on the disk)')
+    parser.add_argument(
+        '--n_jobs', type=int, default=N_JOBS,
+        help=f'number of threads to use when checking for files on disk (default: {N_JOBS})')
     args = parser.parse_args()
 
     # parse
     global_config_file = args.global_config
     regenerate = getattr(args, FLAG_REGENERATE.lstrip('-'))
     empty = getattr(args, FLAG_EMPTY.lstrip('-'))
+    n_jobs = args.n_jobs
 
     # load global config
     with open(global_config_file) as file:
         global_config = json.load(file)
 
-    run(global_config, regenerate=regenerate, empty=empty)
+    run(global_config, regenerate=regenerate, empty=empty, n_jobs=n_jobs)
@@ -48,6 +48,17 @@ def move_target_to_symlink(symlink: Path) -> None:
         raise ValueError(f"symlink is not a symlink: {symlink}\nDoing nothing.")
 
 
+def is_empty_dir(dpath) -> bool:
+    '''
+    Check if a directory is empty without listing all of its entries.
+
+    Stops at the first entry found (the Nextflow work directory can contain
+    thousands of task directories).
+    '''
+    with os.scandir(dpath) as entries:
+        return next(entries, None) is None
+
+
 def parse_data(global_configs, bids_dir, participant_id, session_id, use_bids_filter=False, logger=None):
     """ Parse and verify the input files to build TractoFlow's simplified input to avoid their custom BIDS filter
     """
@@ -514,7 +525,7 @@ def run(participant_id, global_configs, session_id, output_dir, use_bids_filter,
 
     ## just make copies if they aren't already there - resume option cannot work w/ modified (recopied) files, so check first
     ## delete on success?
-    if len(os.listdir(tractoflow_subj_dir)) == 0:
+    if is_empty_dir(tractoflow_subj_dir):
         shutil.copyfile(dmrifile, Path(tractoflow_subj_dir, 'dwi.nii.gz').joinpath())
         shutil.copyfile(bvalfile, Path(tractoflow_subj_dir, 'bval').joinpath())
         shutil.copyfile(bvecfile, Path(tractoflow_subj_dir, 'bvec').joinpath())
@@ -674,7 +685,7 @@ def run(participant_id, global_configs, session_id, output_dir, use_bids_filter,
     ## I don't know if the problem is python printing unhelpful/inaccurate text to the user or if nextflow can't parse its own input arguments correctly.
 
     ## add resume option if working directory is not empty
-    if not len(os.listdir(tractoflow_work_dir)) == 0:
+    if not is_empty_dir(tractoflow_work_dir):
         TRACTOFLOW_CMD = TRACTOFLOW_CMD + " -resume"
 
     ## build command line call
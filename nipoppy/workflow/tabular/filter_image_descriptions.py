@@ -2,8 +2,11 @@
 
 import argparse
 import json
+import re
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 # BIDS datatypes are folder names under the subject folder, typically related to imaging modalities (anat, dwi, func, etc.)
@@ -31,6 +34,10 @@ GLOBAL_CONFIG_DATASET_ROOT = 'DATASET_ROOT'
 DPATH_OTHER_RELATIVE = Path('tabular', 'other')  # relative to DATASET_ROOT
 FLAG_OVERWRITE = '--overwrite'
 
+# lowercased copies of the columns used for substring matching
+COL_DESCRIPTION_LOWER = f'{COL_DESCRIPTION_IMAGING} (lowercase)'
+COL_PROTOCOL_LOWER = f'{COL_PROTOCOL_IMAGING} (lowercase)'
+
 # mapping from BIDS datatype/suffix to PPMI "Modality" column
 # the PPMI "Modality" column is not 100% accurate so we still have to check description strings
 DATATYPE_MODALITY_MAP = {
@@ -59,7 +66,13 @@ def run(global_config_file, overwrite=False, indent=4):
     fpath_out_ignored = dpath_out / FNAME_IGNORED
 
     # load df
-    df_imaging = pd.read_csv(fpath_imaging)
+    # only parse the columns used for filtering
+    df_imaging = pd.read_csv(
+        fpath_imaging,
+        usecols=[COL_MODALITY_IMAGING, COL_DESCRIPTION_IMAGING, COL_PROTOCOL_IMAGING],
+        dtype={COL_MODALITY_IMAGING: 'category'}, # only a few modalities
+    )
+    df_imaging = add_lowercase_columns(df_imaging) # once instead of in every filter_descriptions call
     descriptions = {}
 
     # dwi
@@ -144,10 +157,11 @@ def run(global_config_file, overwrite=False, indent=4):
     print(f'JSON file with datatype-descriptions mapping written to: {fpath_out_descriptions}')
 
     # save another file with all images that didn't make it in any datatype
-    df_ignored: pd.DataFrame = df_imaging.loc[
-        ~df_imaging[COL_DESCRIPTION_IMAGING].isin(descriptions_all),
-        COL_DESCRIPTION_IMAGING,
-    ].drop_duplicates().sort_values()
+    # (check unique descriptions only, against a set of all kept descriptions)
+    descriptions_unique = df_imaging[COL_DESCRIPTION_IMAGING].drop_duplicates()
+    df_ignored: pd.DataFrame = descriptions_unique.loc[
+        ~descriptions_unique.isin(set(descriptions_all))
+    ].sort_values()
     df_ignored.to_csv(fpath_out_ignored, index=False)
     print(f'Ignored descriptions written to: {fpath_out_ignored}')
 
@@ -193,22 +207,26 @@ def filter_descriptions(
     """
     modality = DATATYPE_MODALITY_MAP[datatype]
 
+    if COL_DESCRIPTION_LOWER not in df.columns or COL_PROTOCOL_LOWER not in df.columns:
+        df = add_lowercase_columns(df)
+
     # filter based on imaging protocol column (e.g., Weighting, Acquisition Type)
     # rows that are excluded are completely rejected (not considered 'out-of-modality')
     protocol_filters_str = ''
     if protocol_include is not None:
         df = df.loc[
-            df[COL_PROTOCOL_IMAGING].str.lower().str.contains('|'.join(protocol_include).lower(), na=False)
+            df[COL_PROTOCOL_LOWER].str.contains(get_substrings_regex(protocol_include), na=False)
         ]
         protocol_filters_str = f'{protocol_filters_str}\n\t- WITH: {", ".join(protocol_include)}'
     if protocol_exclude is not None:
         df = df.loc[
-            ~df[COL_PROTOCOL_IMAGING].str.lower().str.contains('|'.join(protocol_exclude).lower(), na=False)
+            ~df[COL_PROTOCOL_LOWER].str.contains(get_substrings_regex(protocol_exclude), na=False)
         ]
         protocol_filters_str = f'{protocol_filters_str}\n\t- WITHOUT: {", ".join(protocol_exclude)}'
     
     # initial set of descriptions
-    df_modality = df.loc[df[COL_MODALITY_IMAGING] == modality]
+    modality_mask = (df[COL_MODALITY_IMAGING] == modality).to_numpy()
+    df_modality = df.loc[modality_mask]
     descriptions = df_modality[COL_DESCRIPTION_IMAGING].value_counts()
     print(f'Found {len(descriptions)} unique description strings for modality {modality}{protocol_filters_str}')
 
@@ -224,33 +242,29 @@ def filter_descriptions(
     # filter based on description strings (substring matching)
     if reject_substrings is not None and len(reject_substrings) > 0:
 
+        reject_mask = contains_substrings(descriptions.index, reject_substrings)
+
+        # exceptions are removed from the reject mask directly
+        # instead of being concatenated back after rejection
         if reject_substrings_exceptions is not None:
-            descriptions_keep = descriptions.loc[
-                descriptions.index.str.lower().str.contains('|'.join(reject_substrings_exceptions).lower())
-            ]
+            reject_mask &= ~contains_substrings(descriptions.index, reject_substrings_exceptions)
             reject_substrings_exceptions_str = f' (except {reject_substrings_exceptions})'
         else:
-            descriptions_keep = None
             reject_substrings_exceptions_str = ''
 
-        descriptions = descriptions.loc[
-            ~descriptions.index.str.lower().str.contains('|'.join(reject_substrings).lower())
-        ]
-
-        descriptions = pd.concat([descriptions, descriptions_keep])
-        descriptions = descriptions.loc[~descriptions.index.duplicated()]
+        descriptions = descriptions.loc[~reject_mask]
 
         print(f'\nGot {len(descriptions)} unique descriptions after removing those that contained one of {reject_substrings}{reject_substrings_exceptions_str}')
 
     # find descriptions that don't contain a common substring
-    suspicious_descriptions = descriptions.loc[~descriptions.index.str.lower().str.contains('|'.join(common_substrings).lower())]
+    suspicious_descriptions = descriptions.loc[~contains_substrings(descriptions.index, common_substrings)]
     print(f'\n{len(suspicious_descriptions)} descriptions out of {len(descriptions)} do not contain any of {common_substrings}')
     print(f'Make sure that they are indeed {datatype.upper()}, otherwise add them to exclude_in list')
     print('-'*30)
     print(suspicious_descriptions)
 
     # check other modalities
-    df_other_modalities = df.loc[~df.index.isin(df_modality.index)]
+    df_other_modalities = df.loc[~modality_mask]
 
     # remove known bad descriptions
     exclude_out_str = ''
@@ -275,9 +289,15 @@ def filter_descriptions(
         print(common_descriptions_other_modalities)
 
     # find descriptions in other modalities that have a common substring
+    # (substring matching is done on unique descriptions only since many rows share the same one)
+    df_other_modalities_unique = df_other_modalities.drop_duplicates(COL_DESCRIPTION_IMAGING)
+    descriptions_other_modalities_matched = df_other_modalities_unique.loc[
+        df_other_modalities_unique[COL_DESCRIPTION_LOWER].str.contains(get_substrings_regex(common_substrings), na=False),
+        COL_DESCRIPTION_IMAGING,
+    ]
     descriptions_new = df_other_modalities.loc[
         (
-            (df_other_modalities[COL_DESCRIPTION_IMAGING].str.lower().str.contains('|'.join(common_substrings).lower()))
+            (df_other_modalities[COL_DESCRIPTION_IMAGING].isin(descriptions_other_modalities_matched))
             & (~df_other_modalities[COL_DESCRIPTION_IMAGING].isin(descriptions.index))
         ),
         COL_DESCRIPTION_IMAGING,
@@ -292,26 +312,66 @@ def filter_descriptions(
         print(descriptions_new)
 
     # combine
-    descriptions = sorted(pd.concat([descriptions, descriptions_new]).index.drop_duplicates().to_list())
+    descriptions = sorted(set(descriptions.index).union(descriptions_new.index))
 
     return descriptions
 
 
+def contains_substrings(descriptions, substrings):
+    """Return a boolean mask for descriptions that contain one of the substrings (case-insensitive)."""
+    # plain loop instead of the pandas .str accessor: the unique descriptions
+    # are a short list so the accessor overhead dominates
+    regex = get_substrings_regex(substrings)
+    return np.array([regex.search(description.lower()) is not None for description in descriptions], dtype=bool)
+
+
+def get_substrings_regex(substrings):
+    """Return a compiled regex matching any of the (lowercased) substrings."""
+    # order/duplicates do not matter for whether there is a match, so lists
+    # with the same substrings share the same compiled regex
+    return _compile_substrings_regex(tuple(sorted(set(substrings))))
+
+
+@lru_cache(maxsize=None)
+def _compile_substrings_regex(substrings: tuple):
+    # the substrings are regex patterns themselves (e.g. 't2\*') so they are not escaped
+    # compiled once per list instead of by pandas in every str.contains call
+    return re.compile('|'.join(substrings).lower())
+
+
+def add_lowercase_columns(df: pd.DataFrame):
+    """Add lowercased description and imaging protocol columns for case-insensitive matching."""
+    return df.assign(**{
+        COL_DESCRIPTION_LOWER: df[COL_DESCRIPTION_IMAGING].str.lower(),
+        COL_PROTOCOL_LOWER: df[COL_PROTOCOL_IMAGING].str.lower(),
+    })
+
+
 def get_all_descriptions(descriptions_dict, verbose=False):
-    
-    def _get_all_descriptions(descriptions_dict_or_list, descriptions, print_prefix):
-        if isinstance(descriptions_dict_or_list, dict):
-            for key, descriptions_subdict_or_list in descriptions_dict_or_list.items():
-                if verbose:
-                    print(f'{print_prefix}{key}:', end='')
-                descriptions = _get_all_descriptions(descriptions_subdict_or_list, descriptions, f'\t{print_prefix}')
+
+    if not isinstance(descriptions_dict, dict):
+        if verbose:
+            print(f' {len(descriptions_dict)}')
+        return list(descriptions_dict)
+
+    # depth-first traversal with an explicit stack instead of recursion
+    # (children are pushed in reverse so they are popped in their original order)
+    descriptions = []
+    stack = [(key, value, '') for key, value in reversed(descriptions_dict.items())]
+    while stack:
+        key, descriptions_subdict_or_list, print_prefix = stack.pop()
+        if verbose:
+            print(f'{print_prefix}{key}:', end='')
+        if isinstance(descriptions_subdict_or_list, dict):
+            stack.extend(
+                (key_sub, value_sub, f'\t{print_prefix}')
+                for key_sub, value_sub in reversed(descriptions_subdict_or_list.items())
+            )
         else:
             if verbose:
-                print(f' {len(descriptions_dict_or_list)}')
-            descriptions.extend(descriptions_dict_or_list)
-        return descriptions
-
-    return _get_all_descriptions(descriptions_dict, [], '')
+                print(f' {len(descriptions_subdict_or_list)}')
+            descriptions.extend(descriptions_subdict_or_list)
+    return descriptions
 
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@ import datetime
 import json
 import shutil
 import warnings
+from collections import Counter
 from pathlib import Path
 
 import numpy as np
@@ -120,15 +121,27 @@ def run(global_config_file: str, regenerate: bool, make_release: bool):
     with fpath_descriptions.open('r') as file_descriptions:
         datatype_descriptions_map: dict = json.load(file_descriptions)
     
-    # reverse the mapping
+    # reverse the mapping (first datatype wins for duplicated descriptions)
+    description_datatype_pairs = [
+        (description, datatype)
+        for datatype in DATATYPES
+        for description in get_all_descriptions(datatype_descriptions_map[datatype])
+    ]
     description_datatype_map = {}
-    for datatype in DATATYPES:
-        descriptions = get_all_descriptions(datatype_descriptions_map[datatype])
-        for description in descriptions:
-            if description in description_datatype_map:
-                warnings.warn(f'\nDescription {description} has more than one associated datatype, using "{description_datatype_map[description]}"\n')
-            else:
-                description_datatype_map[description] = datatype
+    for description, datatype in description_datatype_pairs:
+        description_datatype_map.setdefault(description, datatype)
+
+    description_counts = Counter(description for description, _ in description_datatype_pairs)
+    descriptions_duplicated = {
+        description: description_datatype_map[description]
+        for description, count in description_counts.items()
+        if count > 1
+    }
+    if len(descriptions_duplicated) > 0:
+        warnings.warn(
+            '\nSome descriptions have more than one associated datatype'
+            f', using the first one: {descriptions_duplicated}\n'
+        )
 
     # ===== format tabular data =====
 
@@ -261,9 +274,11 @@ def run(global_config_file: str, regenerate: bool, make_release: bool):
     df_manifest = df_manifest.loc[~df_manifest[COL_SUBJECT_MANIFEST].isin(subjects_without_demographic)]
 
     # replace NA datatype by empty list
-    df_manifest[COL_DATATYPE_MANIFEST] = df_manifest[COL_DATATYPE_MANIFEST].apply(
-        lambda datatype: datatype if isinstance(datatype, list) else []
-    )
+    # (list comprehension over the underlying array avoids per-row apply overhead)
+    df_manifest[COL_DATATYPE_MANIFEST] = [
+        datatype if isinstance(datatype, list) else []
+        for datatype in df_manifest[COL_DATATYPE_MANIFEST].to_numpy()
+    ]
 
     # convert session to BIDS format
     with_imaging = ~df_manifest[COL_SESSION_MANIFEST].isna()
@@ -272,18 +287,23 @@ def run(global_config_file: str, regenerate: bool, make_release: bool):
     )
 
     # populate other columns
-    for col in COLS_MANIFEST:
-        if not (col in df_manifest.columns):
-            df_manifest[col] = np.nan
+    # (add them all at once to avoid fragmenting the dataframe)
+    cols_missing = [col for col in COLS_MANIFEST if not (col in df_manifest.columns)]
+    if len(cols_missing) > 0:
+        df_manifest = pd.concat(
+            [df_manifest, pd.DataFrame(np.nan, index=df_manifest.index, columns=cols_missing)],
+            axis='columns',
+        )
 
     # only keep new subject/session pairs
     # otherwise we build/rebuild the manifest from scratch
     if (not regenerate) and (df_manifest_old is not None):
 
-        subject_session_pairs_old = pd.Index(zip(
-            df_manifest_old[COL_SUBJECT_MANIFEST],
-            df_manifest_old[COL_SESSION_MANIFEST],
-        ))
+        # MultiIndex stores integer codes, so isin does not hash Python tuples
+        subject_session_pairs_old = pd.MultiIndex.from_arrays([
+            df_manifest_old[COL_SUBJECT_MANIFEST].to_numpy(),
+            df_manifest_old[COL_SESSION_MANIFEST].to_numpy(),
+        ])
 
         df_manifest = df_manifest.set_index([COL_SUBJECT_MANIFEST, COL_SESSION_MANIFEST])
 
@@ -303,11 +323,7 @@ def run(global_config_file: str, regenerate: bool, make_release: bool):
 
     # reorder columns and sort
     df_manifest = df_manifest[COLS_MANIFEST]
-    df_manifest = df_manifest.sort_values(
-        COL_VISIT_MANIFEST, 
-        key=(lambda visits: visits.apply(global_config[GLOBAL_CONFIG_VISITS].index)),
-    )
-    df_manifest = df_manifest.sort_values(COL_SUBJECT_MANIFEST, kind='stable').reset_index(drop=True)
+    df_manifest = sort_manifest(df_manifest, visits).reset_index(drop=True)
 
     # drop duplicates (based on df cast as string)
     df_manifest = df_manifest.loc[df_manifest.astype(str).drop_duplicates().index]
@@ -331,6 +347,15 @@ def run(global_config_file: str, regenerate: bool, make_release: bool):
     if make_release:
         make_new_release(dpath_dataset, dpaths_include_in_release)
 
+def sort_manifest(df_manifest: pd.DataFrame, visits) -> pd.DataFrame:
+    # sort by subject then by visit order in the global config, in a single
+    # sort_values call with a vectorized visit rank (visits not in the config go last)
+    visit_ranks = {visit: rank for rank, visit in enumerate(visits)}
+    return df_manifest.sort_values(
+        [COL_SUBJECT_MANIFEST, COL_VISIT_MANIFEST],
+        key=lambda col: col.map(visit_ranks) if col.name == COL_VISIT_MANIFEST else col,
+    )
+
 def get_datatype_list(descriptions: pd.Series, description_datatype_map, seen=None):
 
     datatypes = descriptions.map(description_datatype_map)
@@ -161,29 +161,45 @@ def run(fpath_global_config):
 
     # combine everything into a single bagel
     df_bagel = df_demographics.merge(df_assessments, on=[COL_SUBJECT_MANIFEST, COL_VISIT_MANIFEST], how='outer')
-    df_bagel = df_bagel.drop_duplicates().reset_index(drop=True)
-    df_bagel.insert(1, COL_BIDS_ID_MANIFEST, df_bagel[COL_SUBJECT_MANIFEST].apply(participant_id_to_bids_id))
+    df_bagel = df_bagel.drop_duplicates(ignore_index=True)
+    df_bagel.insert(1, COL_BIDS_ID_MANIFEST, map_unique(df_bagel[COL_SUBJECT_MANIFEST], participant_id_to_bids_id))
     print(f'\nGenerated bagel: {df_bagel.shape}')
 
     # save bagel
-    if fpath_bagel.exists() and pd.read_csv(fpath_bagel, dtype=str).equals(df_bagel):
-        print('No changes to bagel file. Will not write new file.')
-    else:
-        save_backup(df_bagel, fpath_bagel, DNAME_BACKUPS_BAGEL)
+    save_if_changed(df_bagel, fpath_bagel, DNAME_BACKUPS_BAGEL, 'bagel')
 
     # make and save dashboard bagel
-    df_dash_bagel = pd.melt(df_bagel, id_vars=DASH_BAGEL_ID_COLS, var_name=DASH_BAGEL_VAR_NAME,value_name=DASH_BAGEL_VAR_VALUE)
+    # ID columns are repeated once per assessment in the long format
+    # so they are made categorical first (integer codes instead of object pointers)
+    df_dash_bagel = pd.melt(
+        df_bagel.astype({col: 'category' for col in DASH_BAGEL_ID_COLS}),
+        id_vars=DASH_BAGEL_ID_COLS, var_name=DASH_BAGEL_VAR_NAME, value_name=DASH_BAGEL_VAR_VALUE,
+        ignore_index=True,
+    )
     df_dash_bagel = df_dash_bagel.rename(columns={COL_VISIT_MANIFEST: COL_SESSION_MANIFEST})
-    df_dash_bagel[COL_SESSION_MANIFEST] = df_dash_bagel[COL_SESSION_MANIFEST].apply(session_id_to_bids_session)
-    save_backup(df_dash_bagel, fpath_dash_bagel, DNAME_BACKUPS_DASH_BAGEL)
+    df_dash_bagel[COL_SESSION_MANIFEST] = map_unique(df_dash_bagel[COL_SESSION_MANIFEST], session_id_to_bids_session)
+    save_if_changed(df_dash_bagel, fpath_dash_bagel, DNAME_BACKUPS_DASH_BAGEL, 'dashboard bagel')
+
+def map_unique(series: pd.Series, func):
+    # call func once per unique value instead of once per row
+    # (the bagels have one row per visit/assessment but few distinct IDs)
+    mapping = {value: func(value) for value in series.unique()}
+    return series.map(mapping)
 
 def process_tabular_and_save(info_dict, dpath_parent, df_manifest, visits, fpath, dname_backups, tag, loading_func=None):
     df = get_tabular_info_and_merge(info_dict, dpath_parent, df_manifest=df_manifest, visits=visits, loading_func=loading_func)
-    if Path(fpath).exists() and pd.read_csv(fpath, dtype=str).equals(df):
+    save_if_changed(df, fpath, dname_backups, tag)
+    return df
+
+def save_if_changed(df: pd.DataFrame, fpath, dname_backups, tag):
+    # compare the CSV text that would be written with the existing file
+    # instead of parsing the existing file back into a dataframe
+    # (the parsed file had string columns so it never matched numeric columns)
+    fpath = Path(fpath)
+    if fpath.exists() and fpath.read_text() == df.to_csv(index=False):
         print(f'No changes to {tag} file. Will not write new file.')
     else:
         save_backup(df, fpath, dname_backups)
-    return df
 
 if __name__ == '__main__':
     # argparse
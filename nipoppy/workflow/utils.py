@@ -1,3 +1,4 @@
+import ast
 import datetime
 import os
 from pathlib import Path
@@ -100,9 +101,16 @@ def load_manifest(fpath_manifest):
             for col 
             in [COL_SUBJECT_MANIFEST, COL_SESSION_MANIFEST]
         },
-        converters={COL_DATATYPE_MANIFEST: pd.eval}
+        converters={COL_DATATYPE_MANIFEST: parse_datatypes}
     )
 
+def parse_datatypes(datatypes_str):
+    # literal_eval is much faster than pd.eval
+    datatypes = ast.literal_eval(datatypes_str)
+    if not (isinstance(datatypes, (list, tuple)) and all(isinstance(datatype, str) for datatype in datatypes)):
+        raise ValueError(f'Invalid datatypes: {datatypes_str}. Must be a string representation of a list of strings')
+    return list(datatypes)
+
 def load_doughnut(fpath_doughnut):
     return pd.read_csv(
         fpath_doughnut, 
@@ -1,7 +1,13 @@
 """Parsers for the CLI."""
 
 import logging
-from argparse import ArgumentParser, HelpFormatter, _ActionsContainer, _SubParsersAction
+from argparse import (
+    ArgumentParser,
+    ArgumentTypeError,
+    HelpFormatter,
+    _ActionsContainer,
+    _SubParsersAction,
+)
 from pathlib import Path
 
 from nipoppy.layout import DEFAULT_LAYOUT_INFO
@@ -24,6 +30,17 @@ VERBOSITY_TO_LOG_LEVEL_MAP = {
 }
 
 
+def _positive_int(value: str) -> int:
+    """Convert a command-line argument to a strictly positive integer."""
+    try:
+        value_int = int(value)
+    except ValueError:
+        raise ArgumentTypeError(f"Invalid integer value: {value}")
+    if value_int < 1:
+        raise ArgumentTypeError(f"Value must be a positive integer, got {value}")
+    return value_int
+
+
 def add_arg_dataset_root(parser: _ActionsContainer) -> _ActionsContainer:
     """Add a --dataset-root argument to the parser."""
     parser.add_argument(
@@ -194,6 +211,15 @@ def add_subparser_doughnut(
             " (default: only append rows for new records)"
         ),
     )
+    parser.add_argument(
+        "--n-jobs",
+        type=_positive_int,
+        default=1,
+        help=(
+            "Number of threads to use when checking for files on disk. Since this is"
+            " I/O-bound, it can be higher than the number of CPUs (default: 1)."
+        ),
+    )
     return parser
 
 
@@ -137,22 +137,19 @@ class Bagel(BaseTabular):
 
         Can optionally filter within a specific participant and/or session.
         """
-        if participant_id is None:
-            participant_ids = set(self[self.col_participant_id])
-        else:
-            participant_ids = {participant_id}
-        if session_id is None:
-            session_ids = set(self[self.col_session_id])
-        else:
-            session_ids = {session_id}
-
-        bagel_subset = self.loc[
+        mask = (
             (self[self.col_pipeline_name] == pipeline_name)
             & (self[self.col_pipeline_version] == pipeline_version)
-            & (self[self.col_participant_id].isin(participant_ids))
-            & (self[self.col_session_id].isin(session_ids))
             & (self[self.col_pipeline_complete] == self.status_success)
-        ]
+        )
+        # only filter on the columns that were specified
+        # (instead of building sets of all existing values)
+        if participant_id is not None:
+            mask &= self[self.col_participant_id] == participant_id
+        if session_id is not None:
+            mask &= self[self.col_session_id] == session_id
+
+        bagel_subset = self.loc[mask]
 
         yield from bagel_subset[
             [self.col_participant_id, self.col_session_id]
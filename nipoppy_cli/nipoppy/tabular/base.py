@@ -205,6 +205,11 @@ class BaseTabular(pd.DataFrame, ABC):
         """Save the dataframe to a file with a backup."""
         tabular_new = self.sort_values() if sort else self
         if fpath_symlink.exists():
+            # fast path: if the file content would be identical, there is no need
+            # to load and validate the existing file (which is done row by row)
+            with contextlib.suppress(Exception):
+                if Path(fpath_symlink).read_text() == tabular_new.to_csv(index=False):
+                    return None
             with contextlib.suppress(Exception):
                 tabular_old = self.load(fpath_symlink)
                 if sort:
@@ -132,3 +132,16 @@ class DicomDirMap(BaseTabular):
             Session, with the BIDS prefix
         """
         return self.set_index(self.index_cols).loc[participant_id, session_id].item()
+
+    def get_dicom_dir_lookup(self) -> dict[tuple[str, str], str]:
+        """Return a mapping from (participant ID, session ID) to DICOM directory.
+
+        This is faster than calling :meth:`get_dicom_dir` repeatedly when
+        looking up many participants/sessions.
+        """
+        return dict(
+            zip(
+                zip(self[self.col_participant_id], self[self.col_session_id]),
+                self[self.col_participant_dicom_dir],
+            )
+        )
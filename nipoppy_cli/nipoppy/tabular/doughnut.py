@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import logging
-from pathlib import Path
-from typing import Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Optional
 
+import pandas as pd
 from pydantic import Field
 from typing_extensions import Self
 
@@ -98,6 +101,28 @@ class Doughnut(Manifest):
         self.loc[(participant_id, session_id), col] = status
         return self.reset_index(inplace=True)
 
+    def set_statuses(
+        self,
+        participants_sessions: Iterable[tuple[str, str]],
+        col: str,
+        status: bool,
+    ) -> Self:
+        """Set one of the statuses for multiple existing records at once.
+
+        This uses a single boolean mask instead of one lookup per record.
+        Participant-session pairs that are not in the doughnut are ignored.
+        """
+        col = self._check_status_col(col)
+        status = self._check_status_value(status)
+        participants_sessions = list(participants_sessions)
+        if len(participants_sessions) == 0:
+            return self
+        mask = pd.MultiIndex.from_frame(self[self.index_cols]).isin(
+            participants_sessions
+        )
+        self.loc[mask, col] = status
+        return self
+
     def _get_participant_sessions_helper(
         self,
         status_col: str,
@@ -150,23 +175,28 @@ def generate_doughnut(
     dpath_organized: Optional[StrOrPathLike] = None,
     dpath_bidsified: Optional[StrOrPathLike] = None,
     empty=False,
+    n_jobs: int = 1,
     logger: Optional[logging.Logger] = None,
 ) -> Doughnut:
-    """Generate a doughnut object."""
+    """Generate a doughnut object.
+
+    Statuses are checked using ``n_jobs`` threads.
+    """
 
     def check_status(
         dpath: Optional[StrOrPathLike],
         dname_subdirectory: StrOrPathLike,
     ):
-        dname_subdirectory = Path(dname_subdirectory)
         if dpath is None:
             status = False
         else:
-            dpath = Path(dpath)
-            dpath_participant: Path = dpath / dname_subdirectory
-            if dpath_participant.exists():
-                status = next(dpath_participant.iterdir(), None) is not None
-            else:
+            # use os.scandir directly: a single directory read (no separate
+            # exists() call) that stops at the first entry
+            dpath_participant = os.path.join(dpath, dname_subdirectory)
+            try:
+                with os.scandir(dpath_participant) as entries:
+                    status = next(entries, None) is not None
+            except (FileNotFoundError, NotADirectoryError):
                 status = False
             logger.debug(f"Status for {dpath_participant}: {status}")
         return status
@@ -179,52 +209,61 @@ def generate_doughnut(
     manifest_imaging_only = manifest.get_imaging_subset()
     logger.debug(f"Imaging-only manifest:\n{manifest_imaging_only}")
 
-    doughnut_records = []
-    for _, manifest_record in manifest_imaging_only.iterrows():
-        participant_id = manifest_record[manifest.col_participant_id]
-        session_id = manifest_record[manifest.col_session_id]
+    participant_ids = manifest_imaging_only[manifest.col_participant_id].to_list()
+    session_ids = manifest_imaging_only[manifest.col_session_id].to_list()
 
-        # get DICOM dir
-        participant_dicom_dir = dicom_dir_map.get_dicom_dir(
-            participant_id=participant_id, session_id=session_id
-        )
-
-        # get BIDS IDs
-        bids_participant = participant_id_to_bids_participant(participant_id)
-        bids_session = session_id_to_bids_session(session_id)
+    # get DICOM dirs
+    # (build the lookup once instead of indexing the mapping for every row)
+    dicom_dir_lookup = dicom_dir_map.get_dicom_dir_lookup()
+    participant_dicom_dirs = [
+        dicom_dir_lookup[participant_id, session_id]
+        for participant_id, session_id in zip(participant_ids, session_ids)
+    ]
 
-        if empty:
-            status_downloaded = False
-            status_organized = False
-            status_bidsified = False
-        else:
-            status_downloaded = check_status(
-                dpath=dpath_downloaded,
-                dname_subdirectory=participant_dicom_dir,
+    if empty:
+        status_downloaded = [False] * len(participant_ids)
+        status_organized = [False] * len(participant_ids)
+        status_bidsified = [False] * len(participant_ids)
+    else:
+        # relative path to the BIDS participant-session directory
+        # (plain strings, no Path object per row)
+        dnames_bids_session = [
+            os.path.join(
+                participant_id_to_bids_participant(participant_id),
+                session_id_to_bids_session(session_id),
             )
-            status_organized = check_status(
-                dpath=dpath_organized,
-                dname_subdirectory=Path(bids_participant, bids_session),
+            for participant_id, session_id in zip(participant_ids, session_ids)
+        ]
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            status_downloaded = list(
+                executor.map(
+                    partial(check_status, dpath_downloaded), participant_dicom_dirs
+                )
             )
-            status_bidsified = check_status(
-                dpath=dpath_bidsified,
-                dname_subdirectory=Path(bids_participant, bids_session),
+            status_organized = list(
+                executor.map(
+                    partial(check_status, dpath_organized), dnames_bids_session
+                )
+            )
+            status_bidsified = list(
+                executor.map(
+                    partial(check_status, dpath_bidsified), dnames_bids_session
+                )
             )
 
-        doughnut_records.append(
-            {
-                Doughnut.col_participant_id: participant_id,
-                Doughnut.col_visit_id: manifest_record[Manifest.col_visit_id],
-                Doughnut.col_session_id: session_id,
-                Doughnut.col_datatype: manifest_record[Manifest.col_datatype],
-                Doughnut.col_participant_dicom_dir: participant_dicom_dir,
-                Doughnut.col_in_raw_imaging: status_downloaded,
-                Doughnut.col_in_sourcedata: status_organized,
-                Doughnut.col_in_bids: status_bidsified,
-            }
-        )
-
-    doughnut = Doughnut(doughnut_records)
+    # build the doughnut column-wise instead of row-by-row
+    doughnut_data = {
+        Doughnut.col_participant_id: participant_ids,
+        Doughnut.col_visit_id: manifest_imaging_only[Manifest.col_visit_id].to_list(),
+        Doughnut.col_session_id: session_ids,
+        Doughnut.col_datatype: manifest_imaging_only[Manifest.col_datatype].to_list(),
+        Doughnut.col_participant_dicom_dir: participant_dicom_dirs,
+        Doughnut.col_in_raw_imaging: pd.Series(status_downloaded, dtype=bool),
+        Doughnut.col_in_sourcedata: pd.Series(status_organized, dtype=bool),
+        Doughnut.col_in_bids: pd.Series(status_bidsified, dtype=bool),
+    }
+
+    doughnut = Doughnut(doughnut_data)
     logger.debug(f"Generated doughnut:\n{doughnut}")
     return doughnut
 
@@ -237,6 +276,7 @@ def update_doughnut(
     dpath_organized: Optional[StrOrPathLike] = None,
     dpath_bidsified: Optional[StrOrPathLike] = None,
     empty=False,
+    n_jobs: int = 1,
     logger: Optional[logging.Logger] = None,
 ) -> Doughnut:
     """Update an existing doughnut file."""
@@ -259,6 +299,7 @@ def update_doughnut(
             dpath_organized=dpath_organized,
             dpath_bidsified=dpath_bidsified,
             empty=empty,
+            n_jobs=n_jobs,
             logger=logger,
         )
     )
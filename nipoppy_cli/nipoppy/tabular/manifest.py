@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
+import ast
 from typing import Optional
 
-import pandas as pd
 from pydantic import ConfigDict, Field, model_validator
 from typing_extensions import Self
 
@@ -38,7 +38,14 @@ class ManifestModel(BaseTabularModel):
         datatype = data.get(Manifest.col_datatype)
         if datatype is not None and not isinstance(datatype, list):
             try:
-                data[Manifest.col_datatype] = pd.eval(datatype)
+                # literal_eval is much faster than pd.eval (this runs for every
+                # row when a manifest or doughnut file is loaded and validated)
+                datatype_parsed = ast.literal_eval(datatype)
+                if isinstance(datatype_parsed, tuple):
+                    datatype_parsed = list(datatype_parsed)
+                # other types (e.g. a quoted string) are left to fail the
+                # list[str] field validation
+                data[Manifest.col_datatype] = datatype_parsed
             except Exception:
                 raise ValueError(
                     f"Invalid datatype: {datatype} ({type(datatype)}))"
@@ -126,20 +133,15 @@ class Manifest(BaseTabular):
         self, participant_id: Optional[str] = None, session_id: Optional[str] = None
     ):
         """Get participant IDs and session IDs."""
-        if participant_id is None:
-            participant_ids = set(self[self.col_participant_id])
-        else:
-            participant_ids = {participant_id}
-        if session_id is None:
-            session_ids = self[self.col_session_id]
-            session_ids = set(session_ids[session_ids.notna()])
-        else:
-            session_ids = {session_id}
-
-        manifest_subset = self[
-            (self[self.col_participant_id].isin(participant_ids))
-            & (self[self.col_session_id].isin(session_ids))
-        ]
+        # only filter on the columns that were specified
+        # (instead of building sets of all existing values)
+        mask = self[self.col_session_id].notna()
+        if participant_id is not None:
+            mask &= self[self.col_participant_id] == participant_id
+        if session_id is not None:
+            mask &= self[self.col_session_id] == session_id
+
+        manifest_subset = self[mask]
 
         yield from manifest_subset[
             [self.col_participant_id, self.col_session_id]
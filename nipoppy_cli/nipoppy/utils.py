@@ -8,11 +8,13 @@ import os
 import re
 import warnings
 from pathlib import Path
-from typing import List, Optional, Sequence, TypeVar
+from typing import TYPE_CHECKING, List, Optional, Sequence, TypeVar
 
-import bids
 import pandas as pd
 
+if TYPE_CHECKING:
+    import bids
+
 StrOrPathLike = TypeVar("StrOrPathLike", str, os.PathLike)
 
 # BIDS
@@ -137,6 +139,9 @@ def create_bids_db(
     resolve_paths=True,
 ) -> bids.BIDSLayout:
     """Create a BIDSLayout using an indexer."""
+    # imported here since pybids is slow to import and only needed for this
+    import bids
+
     dpath_bids = Path(dpath_bids)
     if resolve_paths:
         dpath_bids = dpath_bids.resolve()
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 from nipoppy.config.pipeline import PipelineConfig
+from nipoppy.tabular.doughnut import Doughnut
 from nipoppy.utils import StrOrPathLike
 from nipoppy.workflows.runner import PipelineRunner
 
@@ -42,6 +43,9 @@ class BidsConversionRunner(PipelineRunner):
         )
         self.name = "bids_conversion"
 
+        # participant-session pairs to mark as converted in the doughnut
+        self.participants_sessions_converted: list[tuple[str, str]] = []
+
     @cached_property
     def dpaths_to_check(self) -> list[Path]:
         """Directory paths to create if needed during the setup phase."""
@@ -60,16 +64,14 @@ class BidsConversionRunner(PipelineRunner):
         self, participant_id: Optional[str], session_id: Optional[str]
     ):
         """Return participant-session pairs to run the pipeline on."""
-        participants_sessions_bidsified = set(
-            self.doughnut.get_bidsified_participants_sessions(
-                participant_id=participant_id, session_id=session_id
-            )
-        )
-        for participant_session in self.doughnut.get_organized_participants_sessions(
+        # organized but not BIDSified (single boolean mask)
+        doughnut_subset: Doughnut = self.doughnut.loc[
+            self.doughnut[self.doughnut.col_in_sourcedata]
+            & ~self.doughnut[self.doughnut.col_in_bids].astype(bool)
+        ]
+        yield from doughnut_subset.get_participants_sessions(
             participant_id=participant_id, session_id=session_id
-        ):
-            if participant_session not in participants_sessions_bidsified:
-                yield participant_session
+        )
 
     def run_single(self, participant_id: str, session_id: str):
         """Run BIDS conversion on a single participant/session."""
@@ -88,15 +90,21 @@ class BidsConversionRunner(PipelineRunner):
             participant_id, session_id, container_command=container_command
         )
 
-        # update status
-        self.doughnut.set_status(
-            participant_id=participant_id,
-            session_id=session_id,
+        # status is updated for all participants/sessions at the end of run_main
+        self.participants_sessions_converted.append((participant_id, session_id))
+
+        return invocation_and_descriptor
+
+    def run_main(self, **kwargs):
+        """Run BIDS conversion and update the doughnut entries in one go."""
+        self.participants_sessions_converted = []
+        to_return = super().run_main(**kwargs)
+        self.doughnut.set_statuses(
+            self.participants_sessions_converted,
             col=self.doughnut.col_in_bids,
             status=True,
         )
-
-        return invocation_and_descriptor
+        return to_return
 
     def run_cleanup(self, **kwargs):
         """
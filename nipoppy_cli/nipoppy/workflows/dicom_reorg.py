@@ -2,12 +2,14 @@
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
 import pydicom
 
-from nipoppy.tabular.doughnut import update_doughnut
+from nipoppy.tabular.doughnut import Doughnut, update_doughnut
 from nipoppy.utils import (
     StrOrPathLike,
     participant_id_to_bids_participant,
@@ -21,12 +23,31 @@ def is_derived_dicom(fpath: Path) -> bool:
     Read a DICOM file's header and check if it is a derived file.
 
     Some BIDS converters (e.g. Heudiconv) do not support derived DICOM files.
+    Only the ImageType tag is parsed, the rest of the header and the pixel data
+    are skipped.
     """
-    dcm_info = pydicom.dcmread(fpath)
+    with open(fpath, "rb") as file_dcm:
+        dcm_info = pydicom.dcmread(
+            file_dcm, stop_before_pixels=True, specific_tags=["ImageType"]
+        )
     img_types = dcm_info.ImageType
     return "DERIVED" in img_types
 
 
+def is_derived_series(dpath_series: Path) -> bool:
+    """
+    Check if the DICOM files in a series directory are derived files.
+
+    All files in a series share the same image type, so only the first file found
+    in the directory is read.
+    """
+    with os.scandir(dpath_series) as entries:
+        for entry in entries:
+            if entry.is_file():
+                return is_derived_dicom(Path(entry.path))
+    return False
+
+
 class DicomReorgWorkflow(BaseWorkflow):
     """Workflow for organizing raw DICOM files."""
 
@@ -50,6 +71,14 @@ class DicomReorgWorkflow(BaseWorkflow):
         self.copy_files = copy_files
         self.check_dicoms = check_dicoms
 
+        # one header read per series directory instead of one per file
+        self._is_derived_series = lru_cache(maxsize=None)(is_derived_series)
+
+    @cached_property
+    def dicom_dir_lookup(self) -> dict[tuple[str, str], str]:
+        """Get the DICOM directory of each participant and session (built once)."""
+        return self.dicom_dir_map.get_dicom_dir_lookup()
+
     def get_fpaths_to_reorg(
         self,
         participant_id: str,
@@ -58,9 +87,7 @@ class DicomReorgWorkflow(BaseWorkflow):
         """Get file paths to reorganize for a single participant and session."""
         dpath_downloaded = (
             self.layout.dpath_raw_imaging
-            / self.dicom_dir_map.get_dicom_dir(
-                participant_id=participant_id, session_id=session_id
-            )
+            / self.dicom_dir_lookup[participant_id, session_id]
         )
 
         # make sure directory exists
@@ -88,6 +115,40 @@ class DicomReorgWorkflow(BaseWorkflow):
         """
         return fname_source
 
+    def check_dicom(self, fpath: StrOrPathLike):
+        """
+        Warn if a DICOM file is derived.
+
+        Only error out if the DICOM file cannot be read.
+        """
+        dpath_series = os.path.dirname(fpath)
+        try:
+            if self._is_derived_series(dpath_series):
+                self.logger.warning(
+                    f"Derived DICOM file detected: {fpath}"
+                    f" (series directory: {dpath_series})"
+                )
+        except Exception as exception:
+            raise RuntimeError(
+                f"Error checking DICOM file {fpath}"
+                f" (series directory: {dpath_series}): {exception}"
+            )
+
+    def prefetch_series_info(self, fpaths: list[StrOrPathLike]):
+        """
+        Read the headers of all series directories concurrently.
+
+        This fills the per-series cache used by check_dicom. Errors are not raised
+        here: they are raised again (with the offending file path) when check_dicom
+        is called.
+        """
+        dpaths_series = {os.path.dirname(fpath) for fpath in fpaths}
+        if len(dpaths_series) < 2:
+            return
+        with ThreadPoolExecutor() as executor:
+            for dpath_series in dpaths_series:
+                executor.submit(self._is_derived_series, dpath_series)
+
     def run_single(self, participant_id: str, session_id: str):
         """Reorganize downloaded DICOM files for a single participant and session."""
         # get paths to reorganize
@@ -100,55 +161,76 @@ class DicomReorgWorkflow(BaseWorkflow):
         )
         self.mkdir(dpath_reorganized)
 
+        if self.check_dicoms:
+            self.prefetch_series_info(fpaths_to_reorg)
+
+        # relative paths from destination to source directories, computed once per
+        # directory pair rather than once per file
+        dpath_rel_map: dict[tuple[str, str], str] = {}
+
+        # open the destination directory once so that symlinks can be created
+        # relative to it (if supported by the platform)
+        dir_fd = None
+        if not (self.copy_files or self.dry_run) and os.symlink in os.supports_dir_fd:
+            dir_fd = os.open(dpath_reorganized, os.O_RDONLY | os.O_DIRECTORY)
+
         # do reorg
-        for fpath_source in fpaths_to_reorg:
-            # check file (though only error out if DICOM cannot be read)
-            if self.check_dicoms:
-                try:
-                    if is_derived_dicom(fpath_source):
-                        self.logger.warning(
-                            f"Derived DICOM file detected: {fpath_source}"
-                        )
-                except Exception as exception:
-                    raise RuntimeError(
-                        f"Error checking DICOM file {fpath_source}: {exception}"
-                    )
+        # (use string paths in the loop to avoid creating many Path objects)
+        try:
+            for fpath_source in fpaths_to_reorg:
+                dpath_source, fname_source = os.path.split(fpath_source)
 
-            fpath_dest = dpath_reorganized / self.apply_fname_mapping(
-                fpath_source.name, participant_id=participant_id, session_id=session_id
-            )
+                if self.check_dicoms:
+                    self.check_dicom(fpath_source)
 
-            # do not overwrite existing files
-            if fpath_dest.exists():
-                raise FileExistsError(
-                    f"Cannot move file {fpath_source} to {fpath_dest}"
-                    " because it already exists"
+                fname_dest = self.apply_fname_mapping(
+                    fname_source,
+                    participant_id=participant_id,
+                    session_id=session_id,
                 )
+                fpath_dest = os.path.join(dpath_reorganized, fname_dest)
 
-            # either create symlinks or copy original files
-            if not self.dry_run:
-                if self.copy_files:
-                    self.copy(fpath_source, fpath_dest)
-                else:
-                    fpath_source = os.path.relpath(fpath_source, fpath_dest.parent)
-                    self.create_symlink(path_source=fpath_source, path_dest=fpath_dest)
-
-        # update doughnut entry
-        self.doughnut.set_status(
-            participant_id=participant_id,
-            session_id=session_id,
-            col=self.doughnut.col_in_sourcedata,
-            status=True,
-        )
+                # do not overwrite existing files
+                if os.path.exists(fpath_dest):
+                    raise FileExistsError(
+                        f"Cannot move file {fpath_source} to {fpath_dest}"
+                        " because it already exists"
+                    )
+
+                # either create symlinks or copy original files
+                if not self.dry_run:
+                    if self.copy_files:
+                        self.copy(fpath_source, fpath_dest)
+                    else:
+                        dpaths_key = (dpath_source, os.path.dirname(fpath_dest))
+                        if dpaths_key not in dpath_rel_map:
+                            dpath_rel_map[dpaths_key] = os.path.relpath(*dpaths_key)
+                        fpath_source = os.path.join(
+                            dpath_rel_map[dpaths_key], fname_source
+                        )
+                        self.create_symlink(
+                            path_source=fpath_source,
+                            path_dest=fpath_dest if dir_fd is None else fname_dest,
+                            log_level=logging.DEBUG,
+                            dir_fd=dir_fd,
+                        )
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+
+        if not (self.copy_files or self.dry_run):
+            self.logger.info(
+                f"Created {len(fpaths_to_reorg)} symlinks in {dpath_reorganized}"
+            )
 
     def get_participants_sessions_to_run(self):
         """Return participant-session pairs to reorganize."""
-        participants_sessions_organized = set(
-            self.doughnut.get_organized_participants_sessions()
-        )
-        for participant_session in self.doughnut.get_downloaded_participants_sessions():
-            if participant_session not in participants_sessions_organized:
-                yield participant_session
+        # downloaded but not organized (single boolean mask)
+        doughnut_subset: Doughnut = self.doughnut.loc[
+            self.doughnut[self.doughnut.col_in_raw_imaging]
+            & ~self.doughnut[self.doughnut.col_in_sourcedata].astype(bool)
+        ]
+        yield from doughnut_subset.get_participants_sessions()
 
     def run_setup(self):
         """Update the doughnut in case it is not up-to-date."""
@@ -164,18 +246,28 @@ class DicomReorgWorkflow(BaseWorkflow):
 
     def run_main(self):
         """Reorganize all downloaded DICOM files."""
+        self._is_derived_series.cache_clear()
+        participants_sessions_organized = []
         for (
             participant_id,
             session_id,
         ) in self.get_participants_sessions_to_run():
             try:
                 self.run_single(participant_id, session_id)
+                participants_sessions_organized.append((participant_id, session_id))
             except Exception as exception:
                 self.logger.error(
                     "Error reorganizing DICOM files for participant "
                     f"{participant_id} session {session_id}: {exception}"
                 )
 
+        # update doughnut entries in one go
+        self.doughnut.set_statuses(
+            participants_sessions_organized,
+            col=self.doughnut.col_in_sourcedata,
+            status=True,
+        )
+
     def run_cleanup(self):
         """
         Clean up after main DICOM reorg part is run.
@@ -17,6 +17,7 @@ class DoughnutWorkflow(BaseWorkflow):
         dpath_root: Path,
         empty: bool = False,
         regenerate: bool = False,
+        n_jobs: int = 1,
         fpath_layout: Optional[StrOrPathLike] = None,
         logger: Optional[logging.Logger] = None,
         dry_run: bool = False,
@@ -32,6 +33,7 @@ class DoughnutWorkflow(BaseWorkflow):
 
         self.empty = empty
         self.regenerate = regenerate
+        self.n_jobs = n_jobs
 
     def run_main(self):
         """Generate/update the dataset's doughnut file."""
@@ -53,6 +55,7 @@ class DoughnutWorkflow(BaseWorkflow):
                 dpath_organized=dpath_organized,
                 dpath_bidsified=dpath_bidsified,
                 empty=empty,
+                n_jobs=self.n_jobs,
                 logger=logger,
             )
 
@@ -68,6 +71,7 @@ class DoughnutWorkflow(BaseWorkflow):
                 dpath_organized=dpath_organized,
                 dpath_bidsified=dpath_bidsified,
                 empty=empty,
+                n_jobs=self.n_jobs,
                 logger=logger,
             )
 
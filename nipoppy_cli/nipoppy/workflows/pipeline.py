@@ -286,7 +286,7 @@ class BasePipelineWorkflow(BaseWorkflow, ABC):
             f"patterns: {self.pybids_ignore_patterns}"
         )
 
-        if dpath_bids_db.exists() and list(dpath_bids_db.iterdir()):
+        if dpath_bids_db.exists() and next(dpath_bids_db.iterdir(), None) is not None:
             self.logger.warning(
                 f"Overwriting existing BIDS database directory: {dpath_bids_db}"
             )
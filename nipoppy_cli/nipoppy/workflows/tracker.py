@@ -1,6 +1,7 @@
 """PipelineTracker workflow."""
 
 import logging
+from functools import cached_property
 from typing import List, Optional
 
 from pydantic import TypeAdapter
@@ -51,6 +52,17 @@ class PipelineTracker(BasePipelineWorkflow):
             self.logger.info("Initialized empty bagel")
         return super().run_setup(**kwargs)
 
+    @cached_property
+    def tracker_config_template(self) -> list[dict]:
+        """Load the tracker config file (once, not for every participant/session)."""
+        fpath_tracker_config = self.pipeline_config.TRACKER_CONFIG_FILE
+        if fpath_tracker_config is None:
+            raise ValueError(
+                f"No tracker config file specified for pipeline {self.pipeline_name}"
+                f" {self.pipeline_version}"
+            )
+        return load_json(fpath_tracker_config)
+
     def check_status(self, relative_paths: StrOrPathLike):
         """Check the processing status based on a list of expected paths."""
         for relative_path in relative_paths:
@@ -58,9 +70,10 @@ class PipelineTracker(BasePipelineWorkflow):
                 f"Checking path {self.dpath_pipeline_output / relative_path}"
             )
 
-            matches = list(self.dpath_pipeline_output.glob(str(relative_path)))
-            self.logger.debug(f"Matches: {matches}")
-            if not matches:
+            # stop at the first match instead of listing all of them
+            match = next(self.dpath_pipeline_output.glob(str(relative_path)), None)
+            self.logger.debug(f"First match: {match}")
+            if match is None:
                 return Bagel.status_fail
 
         return Bagel.status_success
@@ -75,16 +88,9 @@ class PipelineTracker(BasePipelineWorkflow):
 
     def run_single(self, participant_id: str, session_id: str):
         """Run tracker on a single participant/session."""
-        # load tracker configs from file
-        fpath_tracker_config = self.pipeline_config.TRACKER_CONFIG_FILE
-        if fpath_tracker_config is None:
-            raise ValueError(
-                f"No tracker config file specified for pipeline {self.pipeline_name}"
-                f" {self.pipeline_version}"
-            )
         # replace template strings
         tracker_configs = self.process_template_json(
-            load_json(fpath_tracker_config),
+            self.tracker_config_template,
             participant_id=participant_id,
             session_id=session_id,
         )
@@ -105,6 +105,7 @@ def test_add_subparser_init():
         ["--dataset-root", "my_dataset", "--empty"],
         ["--dataset-root", "my_dataset", "--regenerate"],
         ["--dataset-root", "my_dataset", "--empty", "--regenerate"],
+        ["--dataset-root", "my_dataset", "--n-jobs", "4"],
     ],
 )
 def test_add_subparser_doughnut(args):
@@ -114,6 +115,18 @@ def test_add_subparser_doughnut(args):
     assert parser.parse_args(["doughnut"] + args)
 
 
+@pytest.mark.parametrize("n_jobs", ["0", "-1", "x", "1.5"])
+def test_add_subparser_doughnut_n_jobs_invalid(n_jobs):
+    parser = ArgumentParser()
+    subparsers = parser.add_subparsers()
+    add_subparser_doughnut(subparsers)
+    with pytest.raises(SystemExit) as exception:
+        parser.parse_args(
+            ["doughnut", "--dataset-root", "my_dataset", "--n-jobs", n_jobs]
+        )
+    assert exception.value.code != 0, "Parsing of invalid argument should fail."
+
+
 @pytest.mark.parametrize(
     "args",
     [
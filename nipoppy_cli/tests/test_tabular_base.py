@@ -227,6 +227,16 @@ def test_save_with_backup_no_change(data1, data2, tmp_path: Path):
     assert len(list(fpath_backup1.parent.iterdir())) == 1
 
 
+def test_save_with_backup_no_change_skips_load(tmp_path: Path, mocker):
+    fpath_symlink = tmp_path / "test.csv"
+    tabular = TabularWithModelNoList([{"a": "a", "b": 1}, {"a": "b", "b": 2}])
+    assert tabular.save_with_backup(fpath_symlink) is not None
+
+    mocked_load = mocker.patch.object(TabularWithModelNoList, "load")
+    assert tabular.save_with_backup(fpath_symlink) is None
+    mocked_load.assert_not_called()
+
+
 @pytest.mark.parametrize("bad_data", [{}, [{"b": 1}]])
 def test_save_with_backup_invalid_existing(bad_data, tmp_path: Path):
     fpath_symlink = tmp_path / "test.csv"
@@ -72,3 +72,13 @@ def test_load_or_generate_generate(
     )
 
     assert dicom_dir_map[DicomDirMap.col_participant_dicom_dir].tolist() == expected
+
+
+def test_get_dicom_dir_lookup():
+    dicom_dir_map = DicomDirMap.load(DPATH_TEST_DATA / "dicom_dir_map1.csv")
+    lookup = dicom_dir_map.get_dicom_dir_lookup()
+    assert len(lookup) == len(dicom_dir_map)
+    for (participant_id, session_id), dicom_dir in lookup.items():
+        assert dicom_dir == dicom_dir_map.get_dicom_dir(
+            participant_id=participant_id, session_id=session_id
+        )
@@ -115,6 +115,32 @@ def test_set_status(data, participant_id, session_id, col, status):
     )
 
 
+@pytest.mark.parametrize("col", Doughnut.status_cols)
+@pytest.mark.parametrize("status", [True, False])
+@pytest.mark.parametrize(
+    "participants_sessions",
+    [[], [("01", "BL")], [("01", "BL"), ("02", "M12")], [("01", "M12"), ("03", "BL")]],
+)
+def test_set_statuses(data, participants_sessions, col, status):
+    doughnut = Doughnut(data)
+    expected = {
+        participant_session: (
+            status
+            if participant_session in participants_sessions
+            else doughnut.get_status(*participant_session, col=col)
+        )
+        for participant_session in doughnut.get_participants_sessions()
+    }
+    doughnut.set_statuses(participants_sessions, col=col, status=status)
+    for (participant_id, session_id), expected_status in expected.items():
+        assert doughnut.get_status(participant_id, session_id, col) == expected_status
+
+
+def test_set_statuses_invalid_col(data):
+    with pytest.raises(ValueError, match="Invalid status column"):
+        Doughnut(data).set_statuses([("01", "BL")], col="invalid", status=True)
+
+
 @pytest.mark.parametrize(
     "status_col,participant_id,session_id,expected_count",
     [
@@ -178,6 +204,7 @@ def test_get_participant_sessions_helper(
 )
 @pytest.mark.parametrize("empty", [True, False])
 @pytest.mark.parametrize("str_paths", [False, True])
+@pytest.mark.parametrize("n_jobs", [1, 4])
 def test_generate_and_update(
     participants_and_sessions_manifest1: dict[str, list[str]],
     participants_and_sessions_manifest2: dict[str, list[str]],
@@ -189,6 +216,7 @@ def test_generate_and_update(
     dpath_bidsified_relative: StrOrPathLike,
     empty: bool,
     str_paths: bool,
+    n_jobs: int,
     tmp_path: Path,
 ):
     dpath_root = tmp_path / "my_dataset"
@@ -222,6 +250,7 @@ def test_generate_and_update(
         dpath_organized=dpath_organized,
         dpath_bidsified=dpath_bidsified,
         empty=empty,
+        n_jobs=n_jobs,
     )
     # the doughnut should have the same number of records as the manifest
     assert len(doughnut1) == len(manifest1)
@@ -247,6 +276,7 @@ def test_generate_and_update(
         dpath_organized=dpath_organized,
         dpath_bidsified=dpath_bidsified,
         empty=empty,
+        n_jobs=n_jobs,
     )
     assert len(doughnut2) == len(manifest2)
 
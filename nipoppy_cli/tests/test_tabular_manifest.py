@@ -48,6 +48,31 @@ def test_validate(fpath, is_valid):
         assert isinstance(manifest.validate(), Manifest)
 
 
+@pytest.mark.parametrize(
+    "datatype,expected",
+    [
+        ("['anat', 'dwi']", ["anat", "dwi"]),
+        ("('anat', 'dwi')", ["anat", "dwi"]),
+        ("[]", []),
+        ("'anat'", None),
+        ("['anat', 1]", None),
+        ("anat", None),
+    ],
+)
+def test_validate_datatype_str(datatype, expected):
+    manifest = Manifest(
+        data={
+            Manifest.col_participant_id: ["01"],
+            Manifest.col_visit_id: ["BL"],
+            Manifest.col_session_id: ["BL"],
+            Manifest.col_datatype: [datatype],
+        }
+    )
+    with pytest.raises(ValueError) if expected is None else nullcontext():
+        manifest = manifest.validate()
+        assert manifest[Manifest.col_datatype].iloc[0] == expected
+
+
 @pytest.mark.parametrize(
     "session_ids,visit_ids,is_valid",
     [
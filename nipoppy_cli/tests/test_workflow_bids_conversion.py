@@ -130,3 +130,42 @@ def test_get_participants_sessions_to_run(
             participant_id=participant_id, session_id=session_id
         )
     ] == expected
+
+
+def test_run_main_updates_doughnut(mocker, tmp_path: Path):
+    workflow = BidsConversionRunner(
+        dpath_root=tmp_path / "my_dataset",
+        pipeline_name="heudiconv",
+        pipeline_version="0.12.2",
+        pipeline_step="convert",
+    )
+    workflow.doughnut = Doughnut().add_or_update_records(
+        records=[
+            {
+                Doughnut.col_participant_id: participant_id,
+                Doughnut.col_session_id: "1",
+                Doughnut.col_visit_id: "1",
+                Doughnut.col_datatype: None,
+                Doughnut.col_participant_dicom_dir: "",
+                Doughnut.col_in_raw_imaging: True,
+                Doughnut.col_in_sourcedata: True,
+                Doughnut.col_in_bids: False,
+            }
+            for participant_id in ["01", "02", "03"]
+        ]
+    )
+
+    def launch_boutiques_run(participant_id, session_id, **kwargs):
+        if participant_id == "02":
+            raise RuntimeError("Conversion failed")
+
+    mocker.patch.object(workflow, "process_container_config")
+    mocker.patch.object(
+        workflow, "launch_boutiques_run", side_effect=launch_boutiques_run
+    )
+
+    workflow.run_main()
+
+    assert [
+        tuple(x) for x in workflow.doughnut.get_bidsified_participants_sessions()
+    ] == [("01", "1"), ("03", "1")]
@@ -1,6 +1,7 @@
 """Tests for DicomReorgWorkflow."""
 
 import logging
+import os
 import shutil
 from pathlib import Path
 
@@ -10,7 +11,11 @@ from nipoppy.tabular.dicom_dir_map import DicomDirMap
 from nipoppy.tabular.doughnut import Doughnut
 from nipoppy.tabular.manifest import Manifest
 from nipoppy.utils import participant_id_to_bids_participant, session_id_to_bids_session
-from nipoppy.workflows.dicom_reorg import DicomReorgWorkflow, is_derived_dicom
+from nipoppy.workflows.dicom_reorg import (
+    DicomReorgWorkflow,
+    is_derived_dicom,
+    is_derived_series,
+)
 
 from .conftest import DPATH_TEST_DATA, create_empty_dataset, get_config, prepare_dataset
 
@@ -26,6 +31,19 @@ def test_is_derived_dicom(fpath, expected_result):
     assert is_derived_dicom(fpath) == expected_result
 
 
+@pytest.mark.parametrize(
+    "fpath,expected_result",
+    [
+        (DPATH_TEST_DATA / "dicom-not_derived.dcm", False),
+        (DPATH_TEST_DATA / "dicom-derived.dcm", True),
+    ],
+)
+def test_is_derived_series(fpath: Path, expected_result, tmp_path: Path):
+    for fname in ["001.dcm", "002.dcm"]:
+        shutil.copyfile(fpath, tmp_path / fname)
+    assert is_derived_series(tmp_path) == expected_result
+
+
 @pytest.mark.parametrize(
     "participant_id,session_id,fpaths,participant_first",
     [
@@ -155,6 +173,46 @@ def test_run_single_error_file_exists(tmp_path: Path):
         workflow.run_single(participant_id, session_id)
 
 
+@pytest.mark.parametrize("supports_dir_fd", [True, False])
+def test_run_single_symlinks(
+    supports_dir_fd: bool, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    participant_id = "01"
+    session_id = "1"
+    dataset_name = "my_dataset"
+
+    workflow = DicomReorgWorkflow(dpath_root=tmp_path / dataset_name)
+
+    manifest = prepare_dataset(
+        participants_and_sessions_manifest={participant_id: [session_id]}
+    )
+    workflow.dicom_dir_map = DicomDirMap.load_or_generate(
+        manifest=manifest, fpath_dicom_dir_map=None, participant_first=True
+    )
+
+    # make sure both symlink creation paths are tested
+    if not supports_dir_fd:
+        monkeypatch.setattr(os, "supports_dir_fd", set())
+
+    fnames = ["test1.dcm", "test2.dcm"]
+    dpath_downloaded = workflow.layout.dpath_raw_imaging / participant_id / session_id
+    dpath_downloaded.mkdir(parents=True)
+    for fname in fnames:
+        (dpath_downloaded / fname).touch()
+
+    workflow.run_single(participant_id, session_id)
+
+    dpath_reorganized = (
+        workflow.layout.dpath_sourcedata
+        / participant_id_to_bids_participant(participant_id)
+        / session_id_to_bids_session(session_id)
+    )
+    for fname in fnames:
+        fpath_dest = dpath_reorganized / fname
+        assert fpath_dest.is_symlink()
+        assert fpath_dest.resolve() == (dpath_downloaded / fname).resolve()
+
+
 def test_run_single_invalid_dicom(tmp_path: Path, caplog: pytest.LogCaptureFixture):
     participant_id = "01"
     session_id = "1"
@@ -212,6 +270,31 @@ def test_run_single_error_dicom_read(tmp_path: Path):
         workflow.run_single(participant_id, session_id)
 
 
+def test_prefetch_series_info(tmp_path: Path):
+    workflow = DicomReorgWorkflow(dpath_root=tmp_path / "my_dataset")
+
+    fpaths = []
+    for dname, fpath_dicom in [
+        ("series1", DPATH_TEST_DATA / "dicom-not_derived.dcm"),
+        ("series2", DPATH_TEST_DATA / "dicom-derived.dcm"),
+        ("series3", None),
+    ]:
+        fpath = tmp_path / "raw" / dname / "001.dcm"
+        fpath.parent.mkdir(parents=True)
+        if fpath_dicom is not None:
+            shutil.copyfile(fpath_dicom, fpath)
+        else:
+            fpath.touch()  # invalid DICOM
+        fpaths.append(fpath)
+
+    # should not raise even if one of the files is invalid
+    workflow.prefetch_series_info(fpaths)
+
+    # valid series are cached, the invalid one is not
+    assert workflow._is_derived_series.cache_info().currsize == 2
+    assert workflow._is_derived_series(str(fpaths[1].parent))
+
+
 def test_copy_files_default(tmp_path: Path):
     dataset_name = "my_dataset"
     workflow = DicomReorgWorkflow(dpath_root=tmp_path / dataset_name)
@@ -419,6 +502,7 @@ def test_run_main(
                         assert not fpath.is_symlink()
                     else:
                         assert fpath.is_symlink()
+                        assert fpath.exists()
                     count += 1
                 assert count > 0
 
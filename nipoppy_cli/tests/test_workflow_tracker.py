@@ -205,6 +205,16 @@ def test_run_single_multiple_configs(
     )
 
 
+def test_run_single_loads_config_once(tracker: PipelineTracker, mocker):
+    mocked_load_json = mocker.patch(
+        "nipoppy.workflows.tracker.load_json",
+        return_value=[{"NAME": "tracker", "PATHS": ["[[NIPOPPY_PARTICIPANT_ID]]"]}],
+    )
+    tracker.run_single("01", "1")
+    tracker.run_single("02", "1")
+    mocked_load_json.assert_called_once()
+
+
 def test_run_single_no_config(tracker: PipelineTracker):
     tracker.pipeline_config.TRACKER_CONFIG_FILE = None
     with pytest.raises(ValueError, match="No tracker config file specified for"):
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nipoppy.workflow.tabular.filter_image_descriptions import filter_descriptions
+
+
+@pytest.mark.parametrize("dtype", [object, "str"])
+def test_filter_descriptions_missing_description(dtype):
+    """Check that a missing description in another modality does not break matching."""
+    df = pd.DataFrame(
+        {
+            "Modality": ["DTI", "DTI", "MRI", "MRI", "fMRI"],
+            "Description": ["DTI_gated", "DTI_gated", "DTI_LR", np.nan, "rsfMRI"],
+            "Imaging Protocol": [np.nan] * 5,
+        },
+        dtype=dtype,
+    )
+    descriptions = filter_descriptions(
+        df=df,
+        datatype="dwi",
+        common_substrings=["dti", "dw"],
+    )
+    assert descriptions == ["DTI_LR", "DTI_gated"]
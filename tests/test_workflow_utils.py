@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import pytest
+
+from nipoppy.workflow.utils import parse_datatypes
+
+
+@pytest.mark.parametrize(
+    "datatypes_str,expected",
+    [
+        ("['anat', 'dwi']", ["anat", "dwi"]),
+        ("('anat',)", ["anat"]),
+        ("[]", []),
+    ],
+)
+def test_parse_datatypes(datatypes_str, expected):
+    assert parse_datatypes(datatypes_str) == expected
+
+
+@pytest.mark.parametrize("datatypes_str", ["'anat'", "['anat', 1]", "{'anat': 1}"])
+def test_parse_datatypes_invalid(datatypes_str):
+    with pytest.raises(ValueError, match="Invalid datatypes"):
+        parse_datatypes(datatypes_str)